@@ -19,8 +19,20 @@ def read_file(path):
         logger.error(f"Error reading file {path}: {str(e)}")
         raise
 
+def read_file_bytes(path):
+    """Read a file and return its raw contents, without decoding them"""
+    try:
+        logger.debug(f"Reading file: {path}")
+        with open(path, 'rb') as f:
+            content = f.read()
+        logger.debug(f"Successfully read {len(content)} bytes from {path}")
+        return content
+    except Exception as e:
+        logger.error(f"Error reading file {path}: {str(e)}")
+        raise
+
 def write_file(path, content):
-    """Write content to a file with backup"""
+    """Write content (str, or bytes written as-is) to a file with backup"""
     backup_path = f"{path}.bak"
     try:
         # Create backup
@@ -30,8 +42,12 @@ def write_file(path, content):
         
         # Write new content
         logger.debug(f"Writing {len(content)} bytes to {path}")
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if isinstance(content, bytes):
+            with open(path, 'wb') as f:
+                f.write(content)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
         
         logger.debug(f"Successfully wrote to {path}")
         return True
@@ -2,17 +2,49 @@
 Client for interacting with the Gemini API Proxy
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
-from typing import Optional
+from typing import Any, Optional
 from logger import setup_logger
 
+# orjson serializes and parses request/response bodies several times faster than the
+# stdlib json; fall back to json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger("gemini_client")
 
 # Rate limiting parameters
 MAX_RETRIES = 3
 RETRY_DELAY = 10  # seconds between retries
 
+# Connections kept open to each proxy host, shared by all swarm workers
+POOL_MAXSIZE = 32
+
+# Session shared by all proxy calls, so concurrent tasks reuse keep-alive connections
+# instead of each opening a new one
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+_session.mount("https://", HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+
+# Headers of the JSON request bodies sent with data=dump_json(...)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize a JSON request body to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+def load_json(data: bytes) -> Any:
+    """Parse a JSON response body (orjson.JSONDecodeError subclasses json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def call_gemini(proxy_url: str, prompt: str) -> str:
     """
     Send a prompt to the Gemini Flask proxy and return the response text.
@@ -36,10 +68,10 @@ def call_gemini(proxy_url: str, prompt: str) -> str:
                 logger.info(f"Retry attempt {attempt+1}/{MAX_RETRIES} after {RETRY_DELAY} seconds...")
                 time.sleep(RETRY_DELAY)
                 
-            response = requests.post(
+            response = _session.post(
                 proxy_url,
-                json={"prompt": prompt},
-                headers={"Content-Type": "application/json"},
+                data=dump_json({"prompt": prompt}),
+                headers=JSON_HEADERS,
                 timeout=60
             )
             
@@ -51,7 +83,7 @@ def call_gemini(proxy_url: str, prompt: str) -> str:
                 continue
                 
             response.raise_for_status()
-            result = response.json()
+            result = load_json(response.content)
             
             if result.get("status") == "error":
                 error_msg = result.get("error", "Unknown error")
@@ -154,9 +186,9 @@ def web_search(proxy_url: str, query: str, max_results: int = 20) -> list:
     
     try:
         payload = {"query": query, "max_results": max_results}
-        resp = requests.post(proxy_url, json=payload, timeout=30)
+        resp = _session.post(proxy_url, data=dump_json(payload), headers=JSON_HEADERS, timeout=30)
         resp.raise_for_status()
-        return resp.json().get("results", [])
+        return load_json(resp.content).get("results", [])
     except Exception as e:
         logger.error(f"Error during web search: {str(e)}")
         return []
@@ -178,9 +210,9 @@ def fetch_url(proxy_url: str, url: str) -> str:
     logger.info(f"Fetching URL {url} via {proxy_url}")
     
     try:
-        resp = requests.post(proxy_url, json={"url": url}, timeout=30)
+        resp = _session.post(proxy_url, data=dump_json({"url": url}), headers=JSON_HEADERS, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        data = load_json(resp.content)
         if 'text' in data:
             logger.info(f"Successfully fetched URL with {len(data['text'])} chars")
             return data['text']
@@ -213,9 +245,9 @@ def scrape_text(proxy_url: str, url: str, selector: Optional[str] = None) -> str
         payload = {"url": url}
         if selector:
             payload["selector"] = selector
-        resp = requests.post(proxy_url, json=payload, timeout=30)
+        resp = _session.post(proxy_url, data=dump_json(payload), headers=JSON_HEADERS, timeout=30)
         resp.raise_for_status()
-        return resp.json().get("text", "")
+        return load_json(resp.content).get("text", "")
     except Exception as e:
         logger.error(f"Error scraping text: {str(e)}")
         return ""
\ No newline at end of file
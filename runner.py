@@ -4,11 +4,23 @@ and capture stdout/stderr
 """
 import subprocess
 import shlex
-from typing import Union, Tuple, List
+import threading
+from typing import Union, Tuple, List, BinaryIO
 from logger import setup_logger
 
 logger = setup_logger("runner")
 
+# Size of the reads from a command's output pipes
+READ_CHUNK_BYTES = 65536
+
+def _split_command(cmd: Union[str, List[str]]) -> List[str]:
+    """Turn a command string into its argument list, logging the command."""
+    if isinstance(cmd, str):
+        logger.debug(f"Running command: {cmd}")
+        return shlex.split(cmd)
+    logger.debug(f"Running command: {' '.join(cmd)}")
+    return cmd
+
 def run_command(cmd: Union[str, List[str]]) -> Tuple[int, str, str]:
     """
     Run a shell command and return exit code, stdout, stderr.
@@ -19,12 +31,7 @@ def run_command(cmd: Union[str, List[str]]) -> Tuple[int, str, str]:
     Returns:
         Tuple of (return_code, stdout, stderr)
     """
-    if isinstance(cmd, str):
-        logger.debug(f"Running command: {cmd}")
-        args = shlex.split(cmd)
-    else:
-        logger.debug(f"Running command: {' '.join(cmd)}")
-        args = cmd
+    args = _split_command(cmd)
     
     try:
         process = subprocess.Popen(
@@ -49,4 +56,67 @@ def run_command(cmd: Union[str, List[str]]) -> Tuple[int, str, str]:
     
     except Exception as e:
         logger.error(f"Error running command: {str(e)}")
-        return 1, "", str(e)
\ No newline at end of file
+        return 1, "", str(e)
+
+def _read_tail(stream: BinaryIO, tail_bytes: int, result: list) -> None:
+    """Drain a pipe, keeping only its last tail_bytes. Appends (tail, total bytes) to result."""
+    tail = b""
+    total = 0
+    for chunk in iter(lambda: stream.read(READ_CHUNK_BYTES), b""):
+        total += len(chunk)
+        # [-0:] would keep everything, so a tail_bytes of zero or less keeps nothing
+        if tail_bytes > 0:
+            tail = (tail + chunk)[-tail_bytes:]
+    result.append((tail, total))
+
+def run_command_streaming(cmd: Union[str, List[str]], tail_bytes: int = 4096) -> Tuple[int, str, str, int, int]:
+    """
+    Run a shell command, keeping only the end of its output.
+    
+    The output is read as it is produced and discarded except for the last
+    tail_bytes of each stream, so memory stays bounded however much a command prints.
+    
+    Args:
+        cmd: Command to run as string or list of args
+        tail_bytes: Bytes kept from the end of stdout and of stderr
+        
+    Returns:
+        Tuple of (return_code, stdout tail, stderr tail, stdout bytes, stderr bytes)
+    """
+    args = _split_command(cmd)
+    
+    try:
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        
+        # Drain stderr on its own thread so that neither pipe fills up and blocks the command
+        stderr_result = []
+        stderr_reader = threading.Thread(target=_read_tail, args=(process.stderr, tail_bytes, stderr_result), daemon=True)
+        stderr_reader.start()
+        stdout_result = []
+        _read_tail(process.stdout, tail_bytes, stdout_result)
+        stderr_reader.join()
+        return_code = process.wait()
+        process.stdout.close()
+        process.stderr.close()
+        
+        (stdout, stdout_bytes), = stdout_result
+        (stderr, stderr_bytes), = stderr_result
+        stdout = stdout.decode(errors="replace")
+        stderr = stderr.decode(errors="replace")
+        
+        logger.debug(f"Command returned with code {return_code}")
+        
+        if return_code != 0:
+            logger.warning(f"Command failed with return code {return_code}")
+            if stderr:
+                logger.debug(f"stderr tail: {stderr[-500:]}")
+        
+        return return_code, stdout, stderr, stdout_bytes, stderr_bytes
+    
+    except Exception as e:
+        logger.error(f"Error running command: {str(e)}")
+        return 1, "", str(e), 0, 0
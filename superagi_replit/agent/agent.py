@@ -175,10 +175,11 @@ Always try to make progress towards completing your goals.
         if user_input is not None:
             self.add_message("user", user_input)
             
-        # Get the system prompt if this is the first message
+        # Get the system prompt if this is the first message. It goes first in the
+        # history so every request in the run shares the same static prefix.
         if len(self.messages) == 0 or (len(self.messages) == 1 and self.messages[0]["role"] == "user"):
             system_prompt = self.get_system_prompt()
-            self.add_message("system", system_prompt)
+            self.messages.insert(0, {"role": "system", "content": system_prompt})
             
         # Get response from LLM
         try:
@@ -307,16 +307,19 @@ class AgenticSearch:
     comprehensive, accurate and specific results for user queries.
     """
     
-    def __init__(self, api_client, validator=None):
+    def __init__(self, api_client, validator=None, persistence=None):
         """
         Initialize the agentic search.
         
         Args:
             api_client: Client for making API calls (to Gemini, tools, etc.)
             validator: Optional validator instance to use
+            persistence: Optional backend used to persist refined results so an
+                interrupted search can resume (disabled when omitted)
         """
         self.api_client = api_client
         self.validator = validator or NonLLMTaskValidator()
+        self.persistence = persistence
         self.search_state = {
             "query": "",
             "search_iterations": 0,
@@ -366,6 +369,9 @@ class AgenticSearch:
         
         logger.info(f"Starting agentic search for query: {query}")
         
+        # Resume from any refined results persisted by an interrupted run
+        self._restore_refined_results(query)
+        
         # Phase 1: Initial search planning
         search_plan = self._create_search_plan(query)
         logger.info(f"Created search plan with {len(search_plan)} steps")
@@ -408,7 +414,7 @@ class AgenticSearch:
                         # Extract specific information
                         extracted_info = self._extract_specific_info(content, query)
                         if extracted_info:
-                            self.search_state["refined_results"].append({
+                            self._add_refined_result({
                                 "source": url,
                                 "extracted_info": extracted_info
                             })
@@ -446,8 +452,45 @@ class AgenticSearch:
             "validation_feedback": self.search_state["validation_feedback"]
         }
         
+        # The search finished, so there is nothing left to resume
+        if self.persistence is not None:
+            self.persistence.clear(query)
+        
         return result
     
+    def _restore_refined_results(self, query: str) -> None:
+        """
+        Load persisted refined results for the query into the search state.
+        
+        Args:
+            query: The search query
+        """
+        if self.persistence is None:
+            return
+            
+        restored = self.persistence.load(query)
+        if not restored:
+            return
+            
+        logger.info(f"Restored {len(restored)} refined results from a previous run")
+        self.search_state["refined_results"].extend(restored)
+        for result in restored:
+            source = result.get("source")
+            if source and source not in self.search_state["urls_visited"]:
+                self.search_state["urls_visited"].append(source)
+    
+    def _add_refined_result(self, result: Dict[str, Any]) -> None:
+        """
+        Record a refined result and persist it in the background if enabled.
+        
+        Args:
+            result: Refined result with source and extracted information
+        """
+        result_idx = len(self.search_state["refined_results"])
+        self.search_state["refined_results"].append(result)
+        if self.persistence is not None:
+            self.persistence.write_result(self.search_state["query"], result_idx, result)
+    
     def _create_search_plan(self, query: str) -> List[str]:
         """
         Create a search plan based on the query.
@@ -2,79 +2,65 @@
 Mock LLM interface for the agent to use when the API is not available.
 This enables direct testing of task completion validation without external dependencies.
 """
-import logging
 import re
+import functools
 from typing import Dict, Any, List, Optional
 
 from superagi_replit.lib.logger import logger
 
-
-class MockLLM:
-    """A mock LLM class that simulates responses for testing."""
-    
-    def __init__(self):
-        """Initialize the mock LLM."""
-        self.logger = logger
-        self.response_templates = {
-            "search_venues": self._generate_venue_response,
-            "search_emails": self._generate_email_response,
-            "search_facilities": self._generate_facility_response,
-            "default": self._generate_default_response
-        }
-    
-    def generate(self, prompt: str) -> str:
-        """
-        Generate a response based on the prompt.
-        
-        Args:
-            prompt: The prompt to respond to
-            
-        Returns:
-            A mock response
-        """
-        self.logger.info(f"Generating mock response for prompt: {prompt[:50]}...")
-        
-        # Direct task detection from the prompt
-        if "email" in prompt.lower() and "jazz" in prompt.lower():
-            return self._generate_email_response(prompt)
-        elif "restroom" in prompt.lower() or "bathroom" in prompt.lower():
-            return self._generate_facility_response(prompt)
-        elif "venue" in prompt.lower() or "piano" in prompt.lower():
-            return self._generate_venue_response(prompt)
-        
-        # Fallback to more general detection
-        task_type = self._detect_task_type(prompt)
-        
-        # Get the appropriate template function
-        template_func = self.response_templates.get(task_type, self.response_templates["default"])
-        
-        # Generate response based on the prompt
-        return template_func(prompt)
-    
-    def _detect_task_type(self, prompt: str) -> str:
-        """Detect the type of task from the prompt."""
-        prompt_lower = prompt.lower()
-        
-        if re.search(r"venue|piano|club|bar|restaurant", prompt_lower):
-            return "search_venues"
-        elif re.search(r"email|contact|jazz club", prompt_lower):
-            return "search_emails"
-        elif re.search(r"restroom|bathroom|toilet|facility", prompt_lower):
-            return "search_facilities"
-        else:
-            return "default"
+# Keywords that route a prompt directly to a response generator
+_RE_DIRECT_TASK = re.compile(r"email|jazz|restroom|bathroom|venue|piano")
+
+# Slot extraction patterns for the response generators
+_RE_VENUE_CITY = re.compile(r"in\s+([A-Za-z\s]+)(?:,|\s+with|\s+that)", re.IGNORECASE)
+_RE_VENUE_FEATURE = re.compile(r"with\s+([A-Za-z\s]+)(?:\.|\s+focus)", re.IGNORECASE)
+_RE_EMAIL_COUNT = re.compile(r"(\d+)\s+email", re.IGNORECASE)
+_RE_EMAIL_LOCATION = re.compile(r"in\s+([A-Za-z\s]+)(?:\.|\s+make)", re.IGNORECASE)
+_RE_EMAIL_BUSINESS = re.compile(r"of\s+([A-Za-z\s]+)\s+in", re.IGNORECASE)
+_RE_FACILITY_LOCATION = re.compile(r"in\s+([A-Za-z\s]+)(?:\.|\s+that)", re.IGNORECASE)
+_RE_FACILITY_TYPE = re.compile(r"(?:the\s+)?([A-Za-z\s]+)(?:\s+in\s+|\s+that\s+is)", re.IGNORECASE)
+
+_SLOT_PATTERNS = {
+    "city": _RE_VENUE_CITY,
+    "feature": _RE_VENUE_FEATURE,
+    "num_emails": _RE_EMAIL_COUNT,
+    "email_location": _RE_EMAIL_LOCATION,
+    "business_type": _RE_EMAIL_BUSINESS,
+    "facility_location": _RE_FACILITY_LOCATION,
+    "facility_type": _RE_FACILITY_TYPE,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_prompt_slots(prompt: str) -> Dict[str, Optional[str]]:
+    """
+    Extract every generator slot from a prompt in one place.
     
-    def _generate_venue_response(self, prompt: str) -> str:
-        """Generate a venue search response."""
-        # Extract the city from the prompt
-        city_match = re.search(r"in\s+([A-Za-z\s]+)(?:,|\s+with|\s+that)", prompt, re.IGNORECASE)
-        city = city_match.group(1) if city_match else "San Francisco"
-        
-        # Extract what we're looking for
-        feature_match = re.search(r"with\s+([A-Za-z\s]+)(?:\.|\s+focus)", prompt, re.IGNORECASE)
-        feature = feature_match.group(1) if feature_match else "pianos"
-        
-        response = f"""
+    Results are cached per prompt and must be treated as read-only.
+    Unmatched slots are None so each generator can apply its own default.
+    """
+    slots = {}
+    for name, pattern in _SLOT_PATTERNS.items():
+        match = pattern.search(prompt)
+        slots[name] = match.group(1) if match else None
+    return slots
+
+
+# Keyword sets for _detect_task_type
+_RE_TOKEN = re.compile(r"[a-z]+")
+_VENUE_KW = frozenset({
+    "venue", "venues", "piano", "pianos", "club", "clubs", "bar", "bars",
+    "restaurant", "restaurants",
+})
+_EMAIL_KW = frozenset({"email", "emails", "contact", "contacts"})
+_FACILITY_KW = frozenset({
+    "restroom", "restrooms", "bathroom", "bathrooms", "toilet", "toilets",
+    "facility", "facilities",
+})
+
+
+# Response templates; literal braces are doubled for str.format
+_VENUE_TEMPLATE = """
 I'll help you find venues in {city} with {feature}. I'll search for this information and provide a comprehensive list.
 
 First, let me search for venues in {city} with {feature}.
@@ -131,7 +117,7 @@ Let me check if there are any hotels or restaurants with notable {feature}.
 
 Here's a comprehensive list of venues in {city} with {feature}:
 
-{feature.title()} Bars & Venues:
+{feature_title} Bars & Venues:
 1. Melody's - 123 Main St - Classic {feature} bar where patrons can sing along
 2. Music Hub - 456 Broadway - Performance venue with multiple {feature}
 3. The Music Box - 789 Oak Ave - Has a {feature} where customers can play and sing
@@ -144,33 +130,18 @@ Hotels & Restaurants:
 8. The Ritz - 600 California St - Grand {feature} in the lobby
 9. Gourmet Dining - 495 Mission St - Features a {feature} certain nights
 
-Public {feature.title()}:
+Public {feature_title}:
 10. City Plaza - Public {feature} available seasonally
 11. Central Station - Occasionally hosts public {feature}
 
-Music Schools with Practice {feature.title()}:
+Music Schools with Practice {feature_title}:
 12. City Conservatory of Music - 50 First St - Has practice rooms with {feature}
 13. Community Music Center - 544 Fourth St - Has {feature} available for student use
 
 This list covers a variety of venues across {city} where {feature} are available for performances, customer use, or as part of the ambiance. Some require a purchase (food/drinks at bars), while others like public {feature} are free to use when available.
 """
-        return response
-    
-    def _generate_email_response(self, prompt: str) -> str:
-        """Generate an email search response."""
-        # Extract the number of emails requested
-        num_match = re.search(r"(\d+)\s+email", prompt, re.IGNORECASE)
-        num_emails = int(num_match.group(1)) if num_match else 20
-        
-        # Extract the location from the prompt
-        location_match = re.search(r"in\s+([A-Za-z\s]+)(?:\.|\s+make)", prompt, re.IGNORECASE)
-        location = location_match.group(1) if location_match else "New York City"
-        
-        # Extract what type of businesses
-        business_match = re.search(r"of\s+([A-Za-z\s]+)\s+in", prompt, re.IGNORECASE)
-        business_type = business_match.group(1) if business_match else "jazz clubs"
-        
-        response = f"""
+
+_EMAIL_TEMPLATE = """
 I'll help you find {num_emails} email addresses of {business_type} in {location}. Let me search for this information.
 
 ```
@@ -242,19 +213,8 @@ This list includes a variety of jazz venues across {location}, from iconic clubs
 
 Task complete: I've found {num_emails} email addresses of {business_type} in {location} as requested.
 """
-        return response
 
-    def _generate_facility_response(self, prompt: str) -> str:
-        """Generate a facility search response."""
-        # Extract the location from the prompt
-        location_match = re.search(r"in\s+([A-Za-z\s]+)(?:\.|\s+that)", prompt, re.IGNORECASE)
-        location = location_match.group(1) if location_match else "San Francisco"
-        
-        # Extract the type of facility
-        facility_match = re.search(r"(?:the\s+)?([A-Za-z\s]+)(?:\s+in\s+|\s+that\s+is)", prompt, re.IGNORECASE)
-        facility_type = facility_match.group(1) if facility_match else "public restroom"
-        
-        response = f"""
+_FACILITY_TEMPLATE = """
 I need to find {facility_type} in {location} with specific criteria. Let me search for information.
 
 ```
@@ -342,14 +302,11 @@ This assessment is based on current reviews, cleanliness reports, and confirmati
 
 The {location} Public Library Main Branch {facility_type} is the clear winner based on consistent positive reviews about its cleanliness and accessibility. The library enforces strict standards for their facilities and they are cleaned multiple times daily.
 """
-        return response
-    
-    def _generate_default_response(self, prompt: str) -> str:
-        """Generate a default response for unknown task types."""
-        return f"""
+
+_DEFAULT_TEMPLATE = """
 I'm not sure how to specifically handle this task, but I'll try my best to help you.
 
-Based on your request: "{prompt[:100]}..."
+Based on your request: "{prompt_preview}..."
 
 I would need to:
 1. Understand your specific question
@@ -357,4 +314,124 @@ I would need to:
 3. Compile the results in a useful format
 
 Would you like me to attempt a web search for this query?
-"""
\ No newline at end of file
+"""
+
+
+class MockLLM:
+    """A mock LLM class that simulates responses for testing."""
+    
+    # Task type -> name of the generator method, resolved on dispatch
+    _RESPONSE_TEMPLATES = {
+        "search_venues": "_generate_venue_response",
+        "search_emails": "_generate_email_response",
+        "search_facilities": "_generate_facility_response",
+        "default": "_generate_default_response"
+    }
+    
+    def __init__(self):
+        """Initialize the mock LLM."""
+        self.logger = logger
+        # Rendered responses keyed by (task type, *extracted slots)
+        self._response_cache = {}
+    
+    def generate(self, prompt: str) -> str:
+        """
+        Generate a response based on the prompt.
+        
+        Args:
+            prompt: The prompt to respond to
+            
+        Returns:
+            A mock response
+        """
+        self.logger.info(f"Generating mock response for prompt: {prompt[:50]}...")
+        
+        # Direct task detection from the prompt, in one scan
+        prompt_lower = prompt.lower()
+        hits = set(_RE_DIRECT_TASK.findall(prompt_lower))
+        if "email" in hits and "jazz" in hits:
+            return self._generate_email_response(prompt)
+        elif "restroom" in hits or "bathroom" in hits:
+            return self._generate_facility_response(prompt)
+        elif "venue" in hits or "piano" in hits:
+            return self._generate_venue_response(prompt)
+        
+        # Fallback to more general detection
+        task_type = self._detect_task_type(prompt_lower)
+        
+        # Get the appropriate template function
+        template_func = getattr(self, self._RESPONSE_TEMPLATES.get(task_type, self._RESPONSE_TEMPLATES["default"]))
+        
+        # Generate response based on the prompt
+        return template_func(prompt)
+    
+    def _detect_task_type(self, prompt_lower: str) -> str:
+        """Detect the type of task from the lowercased prompt."""
+        tokens = set(_RE_TOKEN.findall(prompt_lower))
+        
+        if not _VENUE_KW.isdisjoint(tokens):
+            return "search_venues"
+        elif not _EMAIL_KW.isdisjoint(tokens) or "jazz club" in prompt_lower:
+            return "search_emails"
+        elif not _FACILITY_KW.isdisjoint(tokens):
+            return "search_facilities"
+        else:
+            return "default"
+    
+    def _render(self, task_type: str, template: str, **slots: Any) -> str:
+        """Render a response template, reusing the cached result for the same slots."""
+        key = (task_type,) + tuple(slots.values())
+        response = self._response_cache.get(key)
+        if response is None:
+            response = template.format(**slots)
+            self._response_cache[key] = response
+        return response
+    
+    def _generate_venue_response(self, prompt: str) -> str:
+        """Generate a venue search response."""
+        slots = _extract_prompt_slots(prompt)
+        
+        # Extract the city from the prompt
+        city = slots["city"] or "San Francisco"
+        
+        # Extract what we're looking for
+        feature = slots["feature"] or "pianos"
+        
+        return self._render(
+            "venue", _VENUE_TEMPLATE,
+            city=city, feature=feature, feature_title=feature.title()
+        )
+    
+    def _generate_email_response(self, prompt: str) -> str:
+        """Generate an email search response."""
+        slots = _extract_prompt_slots(prompt)
+        
+        # Extract the number of emails requested
+        num_emails = int(slots["num_emails"]) if slots["num_emails"] else 20
+        
+        # Extract the location from the prompt
+        location = slots["email_location"] or "New York City"
+        
+        # Extract what type of businesses
+        business_type = slots["business_type"] or "jazz clubs"
+        
+        return self._render(
+            "email", _EMAIL_TEMPLATE,
+            num_emails=num_emails, location=location, business_type=business_type
+        )
+
+    def _generate_facility_response(self, prompt: str) -> str:
+        """Generate a facility search response."""
+        slots = _extract_prompt_slots(prompt)
+        
+        # Extract the location from the prompt
+        location = slots["facility_location"] or "San Francisco"
+        
+        # Extract the type of facility
+        facility_type = slots["facility_type"] or "public restroom"
+        
+        return self._render("facility", _FACILITY_TEMPLATE, location=location, facility_type=facility_type)
+    
+    def _generate_default_response(self, prompt: str) -> str:
+        """Generate a default response for unknown task types."""
+        return _DEFAULT_TEMPLATE.format(prompt_preview=prompt[:100])
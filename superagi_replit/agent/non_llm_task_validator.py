@@ -7,8 +7,95 @@ and heuristics to determine objectively when a task is complete.
 """
 import re
 import time
+from collections import deque
 from typing import List, Dict, Any, Tuple, Set, Optional
 
+# The third-party regex engine (installed with nltk) is faster than re on the
+# address and capitalized-word patterns, but slower on the email and word
+# patterns, so it is only used for the former.
+try:
+    import regex as _fast_re
+except ImportError:
+    _fast_re = re
+
+from superagi_replit.agent.text_utils import word_tokens
+
+# Precompiled patterns used on every validator update/check
+_RE_ADDRESS = _fast_re.compile(r"\d+\s+[A-Za-z]+\s+(?:St|Ave|Blvd|Road|Rd|Street|Avenue)", _fast_re.IGNORECASE)
+_RE_EMAIL = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+_RE_NUMBER = re.compile(r"\b(\d+)\b")
+# Numbered ("1. ") or bulleted ("- ", "* ", "• ") list item at the start of a line
+_RE_LIST_LINE = re.compile(r"\s*(?:(\d+\.)|[\*\-•])\s")
+_RE_NUMBERED_START = re.compile(r"^\d+\.", re.MULTILINE)
+# Dates and percentages both start at a digit, so they share a single scan
+_RE_NUMERIC_FACT = re.compile(r"\b(?:(?P<dates>\d{4}[-/]\d{1,2}[-/]\d{1,2})|(?P<percentages>\d+(?:\.\d+)?%))\b")
+_RE_CAP_WORD = _fast_re.compile(r"\b[A-Z][a-z]+\b")
+_RE_URL = re.compile(r"https?://\S+")
+
+# Keyword sets for task type detection
+_LIST_PHRASES = ("find all", "find me")
+_LIST_KW = frozenset({"list", "lists", "gather", "collect"})
+_VENUE_KW = frozenset({
+    "venue", "venues", "club", "clubs", "bar", "bars", "restaurant", "restaurants",
+    "hotel", "hotels", "location", "locations",
+})
+_EMAIL_KW = frozenset({"email", "emails"})
+
+# Completion marker phrases, in priority order
+_COMPLETION_MARKERS = (
+    "task complete", "completed the task", "finished the task",
+    "goal achieved", "goals accomplished", "mission accomplished",
+    "all objectives met", "research complete", "analysis complete",
+    "completed successfully", "here is the final", "in conclusion"
+)
+# Lookahead capture so overlapping markers are all found in one pass
+_RE_COMPLETION_MARKER = re.compile("(?=(" + "|".join(map(re.escape, _COMPLETION_MARKERS)) + "))")
+
+# Entity keywords used to score information coverage
+_ENTITY_TYPES = {
+    "venue": ("venue", "club", "bar", "restaurant", "hotel", "location", "address"),
+    "contact": ("email", "contact", "phone", "number", "@"),
+    "facility": ("restroom", "bathroom", "toilet", "facility"),
+}
+_FACILITY_KW = frozenset({
+    "restroom", "restrooms", "bathroom", "bathrooms", "toilet", "toilets",
+    "facility", "facilities",
+})
+
+
+def _extract_proper_nouns(text: str) -> List[str]:
+    """
+    Extract runs of capitalized words separated only by whitespace.
+    
+    Single capitalized words are matched first and adjacent ones are merged,
+    which avoids backtracking through a repeated multi-word group.
+    """
+    proper_nouns = []
+    run_start = run_end = -1
+    for match in _RE_CAP_WORD.finditer(text):
+        start, end = match.span()
+        if run_end != -1 and start > run_end and text[run_end:start].isspace():
+            run_end = end
+            continue
+        if run_end != -1:
+            proper_nouns.append(text[run_start:run_end])
+        run_start, run_end = start, end
+    if run_end != -1:
+        proper_nouns.append(text[run_start:run_end])
+    return proper_nouns
+
+
+# Number of recent responses read by coverage scoring
+_RECENT_WINDOW = 3
+
+# Upper bound on each information-pattern bucket; coverage saturates at 20 patterns
+_MAX_PATTERNS_PER_BUCKET = 256
+
+def _token_similarity(words1: frozenset, words2: frozenset) -> float:
+    """Jaccard similarity of two pre-tokenized word sets."""
+    intersection = len(words1 & words2)
+    return intersection / max(1, len(words1) + len(words2) - intersection)
+
 
 class NonLLMTaskValidator:
     """
@@ -16,19 +103,67 @@ class NonLLMTaskValidator:
     the agent marking its own work as complete.
     """
     
+    __slots__ = (
+        "iteration_count", "response_history", "_response_history_lower", "tool_uses",
+        "last_activity_time", "informational_patterns", "_pattern_count", "repetition_count",
+        "task_specific_metrics", "_per_response_counts", "_numbered_total",
+        "_bulleted_total", "_email_total", "_response_tokens", "_combined_lower",
+        "_combined_lower_len", "_recent_lower", "_recent_lower_len", "_task_keywords_cache",
+    )
+    
     def __init__(self):
         """Initialize the task validator."""
         self.iteration_count = 0
         self.response_history = []
+        self._response_history_lower = []
         self.tool_uses = {}
-        self.last_activity_time = time.time()
-        self.informational_patterns = {}
+        self.last_activity_time = time.monotonic()
+        self.informational_patterns = {"dates": set(), "percentages": set(), "proper_nouns": set(), "urls": set()}
+        # Total number of distinct information patterns across all buckets
+        self._pattern_count = 0
         self.repetition_count = 0
         self.task_specific_metrics = {}
+        # Recent per-response (numbered, bulleted, email) counts and their running totals
+        self._per_response_counts = deque(maxlen=_RECENT_WINDOW)
+        self._numbered_total = 0
+        self._bulleted_total = 0
+        self._email_total = 0
+        # Word sets of the most recent responses, computed once on arrival
+        self._response_tokens = deque(maxlen=_RECENT_WINDOW)
+        # Lowercased joins of the full and last-three response history, keyed by response count
+        self._combined_lower = ""
+        self._combined_lower_len = -1
+        self._recent_lower = ""
+        self._recent_lower_len = -1
+        # Task description -> (keywords, entity type), constant for a given task
+        self._task_keywords_cache = {}
         
     def reset(self):
-        """Reset the validator state."""
-        self.__init__()
+        """
+        Reset the validator state.
+        
+        Containers are cleared in place, and the per-task keyword cache is kept
+        since it depends only on the task description.
+        """
+        self.iteration_count = 0
+        self.response_history.clear()
+        self._response_history_lower.clear()
+        self.tool_uses.clear()
+        self.last_activity_time = time.monotonic()
+        for patterns in self.informational_patterns.values():
+            patterns.clear()
+        self._pattern_count = 0
+        self.repetition_count = 0
+        self.task_specific_metrics.clear()
+        self._per_response_counts.clear()
+        self._numbered_total = 0
+        self._bulleted_total = 0
+        self._email_total = 0
+        self._response_tokens.clear()
+        self._combined_lower = ""
+        self._combined_lower_len = -1
+        self._recent_lower = ""
+        self._recent_lower_len = -1
         
     def update_metrics(self, 
                      latest_response: str, 
@@ -45,21 +180,43 @@ class NonLLMTaskValidator:
         # Track iteration count
         self.iteration_count += 1
         
-        # Store response for analysis
+        # Store response (and its lowercased form) for analysis
+        latest_lower = latest_response.lower()
         self.response_history.append(latest_response)
+        self._response_history_lower.append(latest_lower)
+        
+        # Count list items and emails once per response and keep running totals.
+        # Lines keep their endings so a marker followed by a newline still counts.
+        numbered = bulleted = 0
+        for line in latest_response.splitlines(keepends=True):
+            match = _RE_LIST_LINE.match(line)
+            if match:
+                if match.group(1):
+                    numbered += 1
+                else:
+                    bulleted += 1
+        emails = len(_RE_EMAIL.findall(latest_response))
+        self._per_response_counts.append((numbered, bulleted, emails))
+        self._numbered_total += numbered
+        self._bulleted_total += bulleted
+        self._email_total += emails
         
         # Update tool usage counts
         if used_tool:
             self.tool_uses[used_tool] = self.tool_uses.get(used_tool, 0) + 1
             
         # Update last activity time
-        self.last_activity_time = time.time()
+        self.last_activity_time = time.monotonic()
+        
+        # Tokenize once; the word set feeds both the repetition check and coverage scoring
+        tokens = word_tokens(latest_lower)
+        self._response_tokens.append(tokens)
         
         # Check for repetition with previous response
-        if len(self.response_history) >= 2:
-            similarity = self._calculate_similarity(
-                self.response_history[-1], 
-                self.response_history[-2]
+        if len(self._response_tokens) >= 2:
+            similarity = _token_similarity(
+                self._response_tokens[-1], 
+                self._response_tokens[-2]
             )
             if similarity > 0.7:  # High similarity threshold
                 self.repetition_count += 1
@@ -89,7 +246,7 @@ class NonLLMTaskValidator:
             return True, f"Maximum iterations reached ({max_iterations})", 1.0
             
         # Check for timeout
-        elapsed = time.time() - self.last_activity_time
+        elapsed = time.monotonic() - self.last_activity_time
         if elapsed > timeout_seconds:
             return True, f"Task timed out after {elapsed:.1f} seconds of inactivity", 0.9
             
@@ -98,8 +255,8 @@ class NonLLMTaskValidator:
             return True, "Task converged (3+ consecutive similar responses)", 0.85
             
         # Check for explicit completion markers in the latest response
-        latest_response = self.response_history[-1] if self.response_history else ""
-        completion_markers = self._extract_completion_markers(latest_response)
+        latest_lower = self._response_history_lower[-1] if self._response_history_lower else ""
+        completion_markers = self._extract_completion_markers(latest_lower)
         if completion_markers:
             marker = completion_markers[0]  # Use the first found marker
             return True, f"Completion marker found: '{marker}'", 0.9
@@ -114,7 +271,7 @@ class NonLLMTaskValidator:
             required_items = 10  # Default
             
             # Check if a specific number is mentioned in the task
-            number_match = re.search(r"\b(\d+)\b", task_description)
+            number_match = _RE_NUMBER.search(task_description)
             if number_match:
                 required_items = int(number_match.group(1))
                 
@@ -123,45 +280,42 @@ class NonLLMTaskValidator:
                 
         elif task_type == "venue":
             # For venue search, check if we have a substantial list of locations
-            venue_keywords = ["venue", "club", "bar", "location", "place", "restaurant", "address"]
-            combined_text = " ".join(self.response_history).lower()
-            
-            # Count occurrence of venue keywords
-            venue_mentions = sum(combined_text.count(keyword) for keyword in venue_keywords)
-            
-            # Count addresses (simplified pattern)
-            addresses = len(re.findall(r"\d+\s+[A-Za-z]+\s+(?:St|Ave|Blvd|Road|Rd|Street|Avenue)", combined_text, re.IGNORECASE))
-            
             list_count = self._count_list_items()
             
-            if list_count >= 5 and addresses >= 3:
-                return True, f"Venue search complete with {list_count} listings and {addresses} addresses", 0.9
+            # Only scan the full history once the cheap list-count gate passes
+            if list_count >= 5:
+                combined_text = self._get_combined_lower()
                 
-        elif task_type == "email":
-            # For email tasks, look for email addresses
-            email_count = 0
-            for response in self.response_history:
-                emails = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", response)
-                email_count += len(emails)
+                # Count addresses (simplified pattern)
+                addresses = len(_RE_ADDRESS.findall(combined_text))
                 
-            required_count = 10  # Default
-            number_match = re.search(r"\b(\d+)\b", task_description)
-            if number_match:
-                required_count = int(number_match.group(1))
+                if addresses >= 3:
+                    return True, f"Venue search complete with {list_count} listings and {addresses} addresses", 0.9
                 
-            if email_count >= required_count:
-                return True, f"Email task complete with {email_count} email addresses found", 0.95
+        elif task_type == "email":
+            # For email tasks, look for email addresses
+            email_count = self._email_total
+            
+            # Only parse the required count once some emails have been found
+            if email_count:
+                required_count = 10  # Default
+                number_match = _RE_NUMBER.search(task_description)
+                if number_match:
+                    required_count = int(number_match.group(1))
+                    
+                if email_count >= required_count:
+                    return True, f"Email task complete with {email_count} email addresses found", 0.95
                 
         elif task_type == "facility":
             # For facility search (like restrooms), check for specific details
-            combined_text = " ".join(self.response_history).lower()
-            
-            # Check for details like addresses, ratings, specific locations
-            has_address = re.search(r"\d+\s+[A-Za-z]+\s+(?:St|Ave|Blvd|Road|Rd|Street|Avenue)", combined_text, re.IGNORECASE) is not None
-            has_rating = any(word in combined_text for word in ["clean", "cleanest", "rating", "review", "stars", "score"])
-            
-            if has_address and has_rating and self.iteration_count >= 5:
-                return True, f"Facility search complete with specific location and quality details", 0.85
+            if self.iteration_count >= 5:
+                combined_text = self._get_combined_lower()
+                
+                # Check for details like ratings, addresses, specific locations
+                has_rating = any(word in combined_text for word in ["clean", "cleanest", "rating", "review", "stars", "score"])
+                
+                if has_rating and _RE_ADDRESS.search(combined_text) is not None:
+                    return True, f"Facility search complete with specific location and quality details", 0.85
             
         # Calculate information gathering sufficiency
         info_coverage = self._calculate_information_coverage(task_description)
@@ -171,162 +325,159 @@ class NonLLMTaskValidator:
         # Default: task is not complete
         return False, "Task in progress", max(0.1, info_coverage)
         
+    def _get_combined_lower(self) -> str:
+        """Get the lowercased text of the whole response history."""
+        if self._combined_lower_len != len(self.response_history):
+            self._combined_lower = " ".join(self._response_history_lower)
+            self._combined_lower_len = len(self.response_history)
+        return self._combined_lower
+        
+    def _get_recent_lower(self) -> str:
+        """Get the lowercased text of the last three responses."""
+        if self._recent_lower_len != len(self.response_history):
+            self._recent_lower = " ".join(self._response_history_lower[-_RECENT_WINDOW:])
+            self._recent_lower_len = len(self.response_history)
+        return self._recent_lower
+        
     def _detect_task_type(self, task_description: str) -> str:
         """Detect the type of task from the description."""
         task_lower = task_description.lower()
+        tokens = word_tokens(task_lower)
         
         # Check for list task
-        if "list" in task_lower or any(word in task_lower for word in ["find all", "find me", "gather", "collect"]):
+        if not _LIST_KW.isdisjoint(tokens) or any(phrase in task_lower for phrase in _LIST_PHRASES):
             return "list"
             
         # Check for venue search
-        if any(word in task_lower for word in ["venue", "club", "bar", "restaurant", "hotel", "location"]):
+        if not _VENUE_KW.isdisjoint(tokens):
             return "venue"
             
         # Check for email search
-        if "email" in task_lower or "@" in task_lower:
+        if not _EMAIL_KW.isdisjoint(tokens) or "@" in task_lower:
             return "email"
             
         # Check for facility search
-        if any(word in task_lower for word in ["restroom", "bathroom", "toilet", "facility"]):
+        if not _FACILITY_KW.isdisjoint(tokens):
             return "facility"
             
         # Default type
         return "general"
         
     def _count_list_items(self) -> int:
-        """Count list items across recent responses."""
-        list_count = 0
-        for response in self.response_history:
-            # Count numbered items
-            list_count += len(re.findall(r"^\s*\d+\.\s", response, re.MULTILINE))
-            
-            # Count bulleted items
-            list_count += len(re.findall(r"^\s*[\*\-•]\s", response, re.MULTILINE))
-            
-        return list_count
-        
-    def _extract_completion_markers(self, text: str) -> List[str]:
-        """Extract completion marker phrases from text."""
-        markers = [
-            "task complete", "completed the task", "finished the task",
-            "goal achieved", "goals accomplished", "mission accomplished",
-            "all objectives met", "research complete", "analysis complete",
-            "completed successfully", "here is the final", "in conclusion"
-        ]
-        
-        found_markers = []
-        for marker in markers:
-            if marker in text.lower():
-                found_markers.append(marker)
-                
-        return found_markers
+        """Count list items across all responses."""
+        return self._numbered_total + self._bulleted_total
+        
+    def _extract_completion_markers(self, text_lower: str) -> List[str]:
+        """Extract completion marker phrases from lowercased text."""
+        found = set(_RE_COMPLETION_MARKER.findall(text_lower))
+        if not found:
+            return []
+        return [marker for marker in _COMPLETION_MARKERS if marker in found]
         
     def _has_substantial_list(self, text: str) -> bool:
         """Check if the text contains a substantial numbered list."""
-        list_items = re.findall(r"^\d+\.", text, re.MULTILINE)
+        list_items = _RE_NUMBERED_START.findall(text)
         return len(list_items) >= 5  # Require at least 5 items for a substantial list
         
     def _extract_information_patterns(self, text: str) -> None:
         """Extract factual information patterns from text."""
-        # Extract dates
-        dates = set(re.findall(r"\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b", text))
-        self.informational_patterns["dates"] = self.informational_patterns.get("dates", set()).union(dates)
+        patterns = self.informational_patterns
+        dates, percentages = patterns["dates"], patterns["percentages"]
+        proper_nouns, urls = patterns["proper_nouns"], patterns["urls"]
+        count_before = len(dates) + len(percentages) + len(proper_nouns) + len(urls)
         
-        # Extract percentages
-        percentages = set(re.findall(r"\b\d+(\.\d+)?%\b", text))
-        self.informational_patterns["percentages"] = self.informational_patterns.get("percentages", set()).union(percentages)
+        # Extract dates and percentages in one pass
+        for match in _RE_NUMERIC_FACT.finditer(text):
+            patterns[match.lastgroup].add(match.group())
         
         # Extract proper nouns (simplified approach)
-        proper_nouns = set(re.findall(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b", text))
-        self.informational_patterns["proper_nouns"] = self.informational_patterns.get("proper_nouns", set()).union(proper_nouns)
+        proper_nouns.update(_extract_proper_nouns(text))
         
         # Extract URLs
-        urls = set(re.findall(r"https?://[^\s]+", text))
-        self.informational_patterns["urls"] = self.informational_patterns.get("urls", set()).union(urls)
+        urls.update(_RE_URL.findall(text))
+        
+        # Bound memory on long runs; only bucket sizes are ever read
+        for bucket in (dates, percentages, proper_nouns, urls):
+            while len(bucket) > _MAX_PATTERNS_PER_BUCKET:
+                bucket.pop()
+        
+        # Keep the running total in step with the newly added patterns
+        self._pattern_count += len(dates) + len(percentages) + len(proper_nouns) + len(urls) - count_before
         
     def _calculate_information_coverage(self, task_description: str) -> float:
         """
         Calculate how well the gathered information covers the task.
         This is a proxy for task completion.
         """
-        # Extract keywords from task description
-        keywords = set(re.findall(r"\b[a-zA-Z]{4,}\b", task_description.lower()))
+        # Extract keywords and entity type from the task description (cached per task)
+        keywords, task_type = self._get_task_keywords(task_description)
         
         # Count information patterns as a proxy for thoroughness
-        pattern_counts = sum(len(items) for items in self.informational_patterns.values())
+        pattern_counts = self._pattern_count
         
         # Combine recent responses for keyword checking
-        recent_text = " ".join(self.response_history[-3:] if len(self.response_history) >= 3 else self.response_history).lower()
+        recent_text = self._get_recent_lower()
         
         # Count keywords from task that appear in recent responses
-        keyword_matches = sum(1 for kw in keywords if kw in recent_text)
+        recent_tokens = frozenset().union(*self._response_tokens)
+        keyword_matches = len(keywords & recent_tokens)
         keyword_coverage = keyword_matches / max(1, len(keywords))
         
         # Special handling for list-based tasks
-        list_items_count = 0
-        for response in self.response_history[-3:] if len(self.response_history) >= 3 else self.response_history:
-            # Count numbered list items
-            list_items = re.findall(r"^\s*\d+\.\s", response, re.MULTILINE)
-            list_items_count += len(list_items)
-            
-            # Count bulleted list items
-            bulleted_items = re.findall(r"^\s*[\*\-•]\s", response, re.MULTILINE)
-            list_items_count += len(bulleted_items)
-            
+        list_items_count = sum(numbered + bulleted for numbered, bulleted, _ in self._per_response_counts)
         list_bonus = min(1.0, list_items_count / 10.0)  # Bonus for having substantial lists (10+ items is max)
         
-        # Check for presence of specific entities related to task
-        entity_types = {
-            "venue": ["venue", "club", "bar", "restaurant", "hotel", "location", "address"],
-            "contact": ["email", "contact", "phone", "number", "@"],
-            "facility": ["restroom", "bathroom", "toilet", "facility"]
-        }
-        
-        task_type = None
-        for entity_type, keywords in entity_types.items():
-            if any(keyword in task_description.lower() for keyword in keywords):
-                task_type = entity_type
-                break
-                
+        # Check for presence of specific entities related to task (at most 1.0 by construction)
         entity_bonus = 0.0
         if task_type:
-            entity_matches = sum(1 for keyword in entity_types[task_type] if keyword in recent_text)
-            entity_bonus = min(1.0, entity_matches / len(entity_types[task_type]))
+            entity_keywords = _ENTITY_TYPES[task_type]
+            entity_bonus = sum(1 for keyword in entity_keywords if keyword in recent_text) / len(entity_keywords)
         
         # More tools used suggests more thorough research
         tools_diversity = len(self.tool_uses) / 3.0  # Normalize by assuming 3 tools is comprehensive
         tool_usage_count = sum(self.tool_uses.values())
         tool_usage_bonus = min(1.0, tool_usage_count / 5.0)  # Bonus for using tools multiple times
         
-        # Combine metrics with appropriate weights
+        # Check if the response is in a good final format ("summary" also covers "in summary")
+        has_conclusion = "conclusion" in recent_text or "summary" in recent_text
+        
+        # Combine metrics with appropriate weights, plus a bonus for having a conclusion
         coverage = (
             (0.3 * keyword_coverage) +
             (0.2 * min(1.0, pattern_counts / 20)) +  # Cap at 20 information patterns
             (0.2 * min(1.0, tools_diversity)) +
             (0.1 * tool_usage_bonus) +
             (0.1 * list_bonus) +
-            (0.1 * entity_bonus)
+            (0.1 * entity_bonus) +
+            (0.1 if has_conclusion else 0.0)
         )
-        
-        # Check if the response is in a good final format
-        has_conclusion = any(marker in recent_text for marker in ["conclusion", "summary", "in summary"])
-        if has_conclusion:
-            coverage += 0.1  # Bonus for having a conclusion
             
         return min(1.0, coverage)  # Ensure maximum of 1.0
         
+    def _get_task_keywords(self, task_description: str) -> Tuple[frozenset, Optional[str]]:
+        """Get the keyword set and entity type for a task description."""
+        cached = self._task_keywords_cache.get(task_description)
+        if cached is None:
+            task_lower = task_description.lower()
+            keywords = word_tokens(task_lower, 4)
+            
+            task_type = None
+            for entity_type, entity_keywords in _ENTITY_TYPES.items():
+                if any(keyword in task_lower for keyword in entity_keywords):
+                    task_type = entity_type
+                    break
+                    
+            cached = (keywords, task_type)
+            self._task_keywords_cache[task_description] = cached
+        return cached
+        
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two text strings."""
         # Convert to word sets for Jaccard similarity
-        words1 = set(re.findall(r"\b[a-zA-Z]{3,}\b", text1.lower()))
-        words2 = set(re.findall(r"\b[a-zA-Z]{3,}\b", text2.lower()))
-        
-        # Calculate Jaccard similarity (intersection over union)
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / max(1, union)
+        return _token_similarity(
+            word_tokens(text1.lower()),
+            word_tokens(text2.lower())
+        )
         
     def get_status_report(self) -> Dict[str, Any]:
         """Get a detailed status report of current metrics."""
@@ -336,5 +487,5 @@ class NonLLMTaskValidator:
             "tool_usages": self.tool_uses,
             "repetition_count": self.repetition_count,
             "information_patterns": {k: len(v) for k, v in self.informational_patterns.items()},
-            "elapsed_since_last_activity": time.time() - self.last_activity_time,
+            "elapsed_since_last_activity": time.monotonic() - self.last_activity_time,
         }
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Persistence backend for agentic search state.
+
+Refined search results are written to disk in the background so that a long
+search interrupted by a crash can resume without repeating the scrapes and
+Gemini extraction calls it already paid for.
+"""
+import os
+import json
+import queue
+import shutil
+import hashlib
+import threading
+from typing import List, Dict, Any, Tuple
+
+from superagi_replit.lib.logger import logger
+
+# Default directory for persisted search state
+DEFAULT_STATE_DIR = "workspace/search_state"
+
+# Maximum number of queued writes flushed per batch
+MAX_BATCH_SIZE = 32
+
+
+def query_hash(query: str) -> str:
+    """Return a stable, filesystem-safe hash for a search query."""
+    return hashlib.sha1(query.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+class PersistenceBackend:
+    """
+    Fire-and-forget writer for refined search results.
+
+    Writes are queued and flushed in batches by a daemon thread, so callers on
+    the search path never block on disk I/O. Each entry is stored as
+    ``<state_dir>/<query_hash>/<result_idx>.json``.
+    """
+
+    def __init__(self, state_dir: str = DEFAULT_STATE_DIR):
+        """
+        Initialize the persistence backend.
+
+        Args:
+            state_dir: Directory where search state is stored
+        """
+        self.state_dir = state_dir
+        self._queue: "queue.Queue[Tuple[Tuple[str, int], bytes]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="search-persistence", daemon=True)
+        self._worker.start()
+
+    def write(self, key: Tuple[str, int], json_bytes: bytes) -> None:
+        """
+        Queue an entry for writing without blocking.
+
+        Args:
+            key: Tuple of (query_hash, result_idx)
+            json_bytes: Serialized JSON payload
+        """
+        self._queue.put((key, json_bytes))
+
+    def write_result(self, query: str, result_idx: int, result: Dict[str, Any]) -> None:
+        """Serialize and queue a single refined result for the given query."""
+        self.write((query_hash(query), result_idx), json.dumps(result).encode("utf-8"))
+
+    def load(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Load previously persisted results for a query, ordered by result index.
+
+        Args:
+            query: The search query
+
+        Returns:
+            List of refined results (empty if nothing was persisted)
+        """
+        query_dir = os.path.join(self.state_dir, query_hash(query))
+        if not os.path.isdir(query_dir):
+            return []
+
+        entries = []
+        for filename in os.listdir(query_dir):
+            stem, ext = os.path.splitext(filename)
+            if ext != ".json" or not stem.isdigit():
+                continue
+            try:
+                with open(os.path.join(query_dir, filename), "rb") as f:
+                    entries.append((int(stem), json.loads(f.read())))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable search state entry {filename}: {e}")
+
+        entries.sort(key=lambda entry: entry[0])
+        return [result for _, result in entries]
+
+    def clear(self, query: str) -> None:
+        """
+        Delete the persisted state for a query once its search has completed.
+
+        Pending writes are flushed first so none of them recreate the directory.
+
+        Args:
+            query: The search query
+        """
+        self.flush()
+        query_dir = os.path.join(self.state_dir, query_hash(query))
+        try:
+            shutil.rmtree(query_dir)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error clearing search state for {query_hash(query)}: {e}")
+
+    def flush(self) -> None:
+        """Block until all queued writes have been written to disk."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        """Drain the write queue in batches of up to MAX_BATCH_SIZE entries."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for key, json_bytes in batch:
+                try:
+                    self._write_entry(key, json_bytes)
+                except OSError as e:
+                    logger.error(f"Error persisting search state {key}: {e}")
+                finally:
+                    self._queue.task_done()
+
+    def _write_entry(self, key: Tuple[str, int], json_bytes: bytes) -> None:
+        """Atomically write a single entry to disk."""
+        hash_value, result_idx = key
+        query_dir = os.path.join(self.state_dir, hash_value)
+        os.makedirs(query_dir, exist_ok=True)
+
+        path = os.path.join(query_dir, f"{result_idx}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_bytes)
+        os.replace(tmp_path, path)
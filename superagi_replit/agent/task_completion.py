@@ -4,8 +4,36 @@ Task Completion Evaluation for SuperAGI.
 This module evaluates whether an agent has completed its tasks and should stop execution.
 """
 import re
+import functools
 from typing import List, Dict, Any, Tuple
 
+from superagi_replit.agent.text_utils import word_tokens
+
+# Explicit completion indicators, matched against the lowercased latest assistant message
+_COMPLETION_PATTERNS = tuple(re.compile(pattern, re.DOTALL) for pattern in (
+    r"task\s+(?:is\s+)?(?:now\s+)?(?:complete|finished|done|accomplished)",
+    r"(?:i|i've|we|we've)\s+(?:have\s+)?(?:now\s+)?(?:complete|accomplished|finished|done|achieved)\s+(?:the|all|your)",
+    r"(?:here|this)\s+(?:is|are)\s+(?:the|your)\s+(?:final|complete|full)",
+    r"(?:goal|goals|objective|objectives)\s+(?:has|have)\s+(?:been|all)\s+(?:achieved|met|completed|fulfilled)",
+    r"(?:found|gathered|collected|compiled)\s+all\s+(?:the|requested|required)",
+    r"(?:in\s+conclusion|to\s+summarize|summing\s+up).{1,50}(?:completed|achieved|done)",
+))
+
+# Patterns used to normalize messages before comparing them
+_RE_CODE_BLOCK = re.compile(r'```.*?```', re.DOTALL)
+_RE_MD_HEADER = re.compile(r'#+\s+.*?\n')
+_RE_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+@functools.lru_cache(maxsize=32)
+def _goal_terms(goals: Tuple[str, ...]) -> frozenset:
+    """Extract the key terms from a run's goals (goals are fixed for the run)."""
+    goal_terms = set()
+    for goal in goals:
+        # Remove common words
+        goal_terms.update(word_tokens(goal.lower(), 4))
+    return frozenset(goal_terms)
+
 
 class TaskCompletion:
     """
@@ -48,25 +76,19 @@ class TaskCompletion:
         recent_messages = assistant_messages[-3:] if len(assistant_messages) >= 3 else assistant_messages
         
         # Check the most recent message for explicit completion indicators
-        last_message = assistant_messages[-1]
-        completion_indicators = [
-            r"(?i)task\s+(?:is\s+)?(?:now\s+)?(?:complete|finished|done|accomplished)",
-            r"(?i)(?:i|i've|we|we've)\s+(?:have\s+)?(?:now\s+)?(?:complete|accomplished|finished|done|achieved)\s+(?:the|all|your)",
-            r"(?i)(?:here|this)\s+(?:is|are)\s+(?:the|your)\s+(?:final|complete|full)",
-            r"(?i)(?:goal|goals|objective|objectives)\s+(?:has|have)\s+(?:been|all)\s+(?:achieved|met|completed|fulfilled)",
-            r"(?i)(?:found|gathered|collected|compiled)\s+all\s+(?:the|requested|required)",
-            r"(?i)(?:in\s+conclusion|to\s+summarize|summing\s+up).{1,50}(?:completed|achieved|done)",
-        ]
-        
-        for pattern in completion_indicators:
-            if re.search(pattern, last_message, re.DOTALL):
+        last_lower = assistant_messages[-1].lower()
+        for pattern in _COMPLETION_PATTERNS:
+            if pattern.search(last_lower):
                 return True, "Agent indicated task completion", 0.95
                 
         # Check if we're seeing loops or repetitive responses
         if len(assistant_messages) >= 3:
-            # Check for similarity in recent messages
-            if TaskCompletion._messages_are_similar(assistant_messages[-1], assistant_messages[-2]):
-                if TaskCompletion._messages_are_similar(assistant_messages[-2], assistant_messages[-3]):
+            # Check for similarity in recent messages, normalizing each message only once
+            last_words = TaskCompletion._normalized_words(assistant_messages[-1])
+            previous_words = TaskCompletion._normalized_words(assistant_messages[-2])
+            if TaskCompletion._word_sets_similar(last_words, previous_words):
+                earlier_words = TaskCompletion._normalized_words(assistant_messages[-3])
+                if TaskCompletion._word_sets_similar(previous_words, earlier_words):
                     return True, "Detected repetitive outputs, suggesting completion", 0.8
         
         # Check if all goals are covered in the messages
@@ -90,30 +112,54 @@ class TaskCompletion:
         Returns:
             True if messages are similar, False otherwise
         """
-        # Extract content without common formatting
-        def normalize(text):
-            # Remove code blocks
-            text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-            # Remove markdown headers
-            text = re.sub(r'#+\s+.*?\n', '', text)
-            # Keep only alphanumeric and whitespace
-            text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-            # Normalize whitespace
-            text = re.sub(r'\s+', ' ', text).strip().lower()
-            return text
-            
-        norm_msg1 = normalize(msg1)
-        norm_msg2 = normalize(msg2)
+        return TaskCompletion._word_sets_similar(
+            TaskCompletion._normalized_words(msg1),
+            TaskCompletion._normalized_words(msg2),
+            threshold
+        )
+    
+    @staticmethod
+    def _normalized_words(text: str) -> frozenset:
+        """
+        Get the set of words in a message, ignoring common formatting.
         
-        # Simple word overlap calculation
-        words1 = set(norm_msg1.split())
-        words2 = set(norm_msg2.split())
+        Args:
+            text: Message content
+            
+        Returns:
+            Set of lowercased words
+        """
+        # Remove code blocks
+        text = _RE_CODE_BLOCK.sub('', text)
+        # Remove markdown headers
+        text = _RE_MD_HEADER.sub('', text)
+        # Keep only alphanumeric and whitespace; split() already collapses whitespace runs
+        text = _RE_NON_ALNUM.sub('', text)
+        return frozenset(text.lower().split())
+    
+    @staticmethod
+    def _word_sets_similar(words1: frozenset, words2: frozenset, threshold: float = 0.7) -> bool:
+        """
+        Check if two normalized word sets overlap enough to count as similar.
         
+        Args:
+            words1: Words of the first message
+            words2: Words of the second message
+            threshold: Similarity threshold (0.0 to 1.0)
+            
+        Returns:
+            True if the word sets are similar, False otherwise
+        """
         if not words1 or not words2:
             return False
             
+        # The overlap is at most the smaller set, so the sizes alone can rule out a match
+        len1, len2 = len(words1), len(words2)
+        if min(len1, len2) / max(len1, len2) < threshold:
+            return False
+            
         overlap = len(words1.intersection(words2))
-        similarity = overlap / max(len(words1), len(words2))
+        similarity = overlap / max(len1, len2)
         
         return similarity >= threshold
     
@@ -133,11 +179,7 @@ class TaskCompletion:
             return 1.0  # No goals means perfect coverage
             
         # Extract key terms from goals
-        goal_terms = set()
-        for goal in goals:
-            # Remove common words
-            terms = re.findall(r'\b[a-zA-Z]{4,}\b', goal.lower())
-            goal_terms.update(terms)
+        goal_terms = _goal_terms(tuple(goals))
             
         if not goal_terms:
             return 1.0  # No meaningful terms to match
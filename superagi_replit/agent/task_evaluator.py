@@ -5,17 +5,129 @@ This module provides functions to determine if a task has been completed success
 is making progress, or should be terminated.
 """
 import re
+import functools
+from collections import deque
 from typing import Dict, List, Any, Tuple
 
 from superagi_replit.lib.logger import logger
 
+# Precompiled patterns used on every metrics update
+_RE_WORD = re.compile(r'\b\w+\b')
+_RE_NUMBERED_ITEM = re.compile(r"^\d+\.\s", re.MULTILINE)
+_COMMON_WORDS = frozenset({
+    "the", "and", "a", "an", "in", "on", "at", "of", "to", "for",
+    "with", "by", "about", "like", "through", "over", "before", "after",
+    "between", "under", "during", "regarding", "into"
+})
+# Unverified-claim phrasings, combined so a response is scanned once
+_RE_HALLUCINATION = re.compile("|".join("(?:%s)" % pattern for pattern in (
+    r"\b(?:according to|as per|based on)\b.{1,30}?\b(?:analysis|study|research|report|findings)\b",
+    r"\b(?:shows|indicates|suggests|demonstrates|proves)\b.{1,30}?\b(?:that|which|how)\b",
+    r"\b(?:significantly|dramatically|substantially)\b.{1,30}?\b(?:increases|decreases|improves|reduces)\b"
+)), re.IGNORECASE)
+
+# Explicit completion indicators, in priority order
+_COMPLETION_INDICATORS = (
+    "task complete", "task completed", "task is complete",
+    "i have completed", "i've completed", "completed the task",
+    "found all the requested information", "finished gathering",
+    "here is the final", "final answer"
+)
+# Language that signals a finished comparison, in priority order
+_COMPARISON_TERMS = (
+    "whereas", "while", "in contrast", "on the other hand",
+    "however", "compared to", "better than", "worse than"
+)
+
+
+def _indicator_scanner(indicators: Tuple[str, ...]) -> "re.Pattern":
+    """Build a pattern that finds every indicator in a single pass over the text."""
+    # Lookahead capture so overlapping indicators are all reported
+    return re.compile("(?=(" + "|".join(map(re.escape, indicators)) + "))")
+
+
+_RE_COMPLETION_INDICATOR = _indicator_scanner(_COMPLETION_INDICATORS)
+_RE_COMPARISON_TERM = _indicator_scanner(_COMPARISON_TERMS)
+
+
+def _first_indicator(scanner: "re.Pattern", indicators: Tuple[str, ...], text_lower: str) -> str:
+    """Return the highest-priority indicator present in the text, or an empty string."""
+    found = set(scanner.findall(text_lower))
+    if not found:
+        return ""
+    for indicator in indicators:
+        if indicator in found:
+            return indicator
+    return ""
+
+
+def _extract_phrases(text: str, spans: List[Tuple[int, int]]) -> List[str]:
+    """
+    Group consecutive whitespace-separated words into non-overlapping 2-3 word phrases.
+    
+    Reuses the word spans from the keyword pass instead of a second regex scan.
+    """
+    phrases = []
+    i = 0
+    count = len(spans)
+    while i + 1 < count:
+        start, end = spans[i]
+        if not text[end:spans[i + 1][0]].isspace():
+            i += 1
+            continue
+        last = i + 1
+        if last + 1 < count and text[spans[last][1]:spans[last + 1][0]].isspace():
+            last += 1
+        phrases.append(text[start:spans[last][1]])
+        i = last + 1
+    return phrases
+
+
+@functools.lru_cache(maxsize=32)
+def _task_keywords(text: str) -> Tuple[str, ...]:
+    """Extract the keywords of a task description (constant for a run)."""
+    text_lower = text.lower()
+    spans = [match.span() for match in _RE_WORD.finditer(text_lower)]
+    
+    # Extract single words, skipping common words
+    words = [text_lower[start:end] for start, end in spans]
+    keywords = [word for word in words if len(word) > 3 and word not in _COMMON_WORDS]
+    
+    # Extract multi-word phrases (2-3 words)
+    phrases = _extract_phrases(text_lower, spans)
+    keywords.extend([phrase for phrase in phrases if len(phrase) > 10])
+    
+    # Ensure uniqueness
+    return tuple(set(keywords))
+
+
+def _token_similarity(words1: frozenset, words2: frozenset) -> float:
+    """Jaccard similarity (intersection over union) of two word sets."""
+    intersection = len(words1 & words2)
+    return intersection / max(1, len(words1) + len(words2) - intersection)
+
+
+def _similarity_exceeds(words1: frozenset, words2: frozenset, threshold: float) -> bool:
+    """Check whether the Jaccard similarity of two word sets exceeds a threshold."""
+    smaller, larger = sorted((len(words1), len(words2)))
+    # Jaccard similarity is at most the ratio of the set sizes
+    if not larger or smaller / larger <= threshold:
+        return False
+    return _token_similarity(words1, words2) > threshold
+
 
 class TaskEvaluator:
     """Evaluates task completion and determines when to stop agent execution."""
     
+    __slots__ = ("previous_responses", "_response_count", "_response_tokens", "task_metrics")
+    
     def __init__(self):
         """Initialize the task evaluator."""
-        self.previous_responses = []
+        # Only the latest responses are compared, so the history is bounded
+        self.previous_responses = deque(maxlen=8)
+        self._response_count = 0
+        # Word sets of the last two responses, tokenized once when each arrives
+        self._response_tokens = deque(maxlen=2)
         self.task_metrics = {
             "information_completeness": 0.0,
             "convergence_rate": 0.0,
@@ -42,11 +154,16 @@ class TaskEvaluator:
         Returns:
             Updated metrics dictionary
         """
-        # Track responses for convergence analysis
+        # Lowercase once for keyword and similarity checks
+        response_lower = response.lower()
+        
+        # Track responses (and their word sets) for convergence analysis
         self.previous_responses.append(response)
+        self._response_count += 1
+        self._response_tokens.append(frozenset(_RE_WORD.findall(response_lower)))
         
         # Extract key information from task description
-        keywords = self._extract_keywords(task_description)
+        keywords = _task_keywords(task_description)
         
         # Count successful vs failed tool calls
         for tool_result in tool_results:
@@ -59,44 +176,30 @@ class TaskEvaluator:
                 if "source" in tool_result:
                     self.task_metrics["information_sources"].add(tool_result["source"])
                     
-        # Check for keyword presence in the response
+        # Check for keyword presence in the response (keywords are already lowercase)
+        keyword_presence = self.task_metrics["keyword_presence"]
         for keyword in keywords:
-            if keyword.lower() in response.lower():
-                if keyword not in self.task_metrics["keyword_presence"]:
-                    self.task_metrics["keyword_presence"][keyword] = 0
-                self.task_metrics["keyword_presence"][keyword] += 1
+            if keyword in response_lower:
+                keyword_presence[keyword] = keyword_presence.get(keyword, 0) + 1
                 
         # Calculate information completeness (what % of keywords are covered)
-        keyword_coverage = len(self.task_metrics["keyword_presence"]) / max(1, len(keywords))
+        keyword_coverage = len(keyword_presence) / max(1, len(keywords))
         self.task_metrics["information_completeness"] = min(1.0, keyword_coverage)
         
         # Detect potential hallucinations (unverified claims)
-        hallucination_patterns = [
-            r"\b(?:according to|as per|based on)\b.{1,30}?\b(?:analysis|study|research|report|findings)\b",
-            r"\b(?:shows|indicates|suggests|demonstrates|proves)\b.{1,30}?\b(?:that|which|how)\b",
-            r"\b(?:significantly|dramatically|substantially)\b.{1,30}?\b(?:increases|decreases|improves|reduces)\b"
-        ]
-        
-        for pattern in hallucination_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            self.task_metrics["potential_hallucinations"] += len(matches)
+        self.task_metrics["potential_hallucinations"] += len(_RE_HALLUCINATION.findall(response))
             
         # Calculate convergence (are we still getting new information?)
-        if len(self.previous_responses) >= 2:
-            current = self.previous_responses[-1].lower()
-            previous = self.previous_responses[-2].lower()
-            
+        if self._response_count >= 2:
             # Simple similarity check (more sophisticated in a real implementation)
-            same_info_ratio = self._calculate_similarity(current, previous)
-            
-            if same_info_ratio > 0.8:  # High similarity with previous response
+            if _similarity_exceeds(self._response_tokens[-1], self._response_tokens[-2], 0.8):  # High similarity with previous response
                 self.task_metrics["convergence_iterations"] += 1
             else:
                 # Reset if we're getting new information
                 self.task_metrics["convergence_iterations"] = 0
                 
             # Calculate convergence rate
-            total_iterations = len(self.previous_responses)
+            total_iterations = self._response_count
             self.task_metrics["convergence_rate"] = self.task_metrics["convergence_iterations"] / max(1, total_iterations)
         
         return self.task_metrics
@@ -120,25 +223,22 @@ class TaskEvaluator:
         Returns:
             Tuple of (is_complete, reason, confidence)
         """
-        # Update metrics with new data
-        self.update_metrics(current_response, tool_results, task_description)
-        
-        # Check for explicit completion indicators
-        completion_indicators = [
-            "task complete", "task completed", "task is complete",
-            "i have completed", "i've completed", "completed the task",
-            "found all the requested information", "finished gathering",
-            "here is the final", "final answer"
-        ]
-        
-        for indicator in completion_indicators:
-            if indicator in current_response.lower():
-                return True, f"Agent indicates completion with: '{indicator}'", 0.95
-        
+        # Cheap checks come first, so a terminating step skips the metric scans.
         # Check if we've reached maximum iterations
         if len(all_responses) >= max_iterations:
             return True, f"Reached maximum iterations ({max_iterations})", 0.9
         
+        response_lower = current_response.lower()
+        
+        # Check for explicit completion indicators
+        indicator = _first_indicator(_RE_COMPLETION_INDICATOR, _COMPLETION_INDICATORS, response_lower)
+        if indicator:
+            return True, f"Agent indicates completion with: '{indicator}'", 0.95
+        
+        # Update metrics with new data
+        self.update_metrics(current_response, tool_results, task_description)
+        task_lower = task_description.lower()
+        
         # Check information completeness (>80% of keywords covered)
         if self.task_metrics["information_completeness"] > 0.8:
             # If we have high info completeness AND convergence, we're likely done
@@ -151,19 +251,18 @@ class TaskEvaluator:
             return True, "Agent has converged (repeating similar information)", 0.75
         
         # Check for task-specific completion indicators
-        if "list" in task_description.lower():
+        # Items start on separate lines, so 5+ items need at least 4 line breaks
+        if "list" in task_lower and current_response.count("\n") >= 4:
             # For listing tasks, check if we have a substantial list
-            list_items = re.findall(r"^\d+\.\s", current_response, re.MULTILINE)
-            if len(list_items) >= 5:  # Consider a list of 5+ items to be substantial
-                return True, f"Found a substantial list with {len(list_items)} items", 0.8
+            list_count = len(_RE_NUMBERED_ITEM.findall(current_response))
+            if list_count >= 5:  # Consider a list of 5+ items to be substantial
+                return True, f"Found a substantial list with {list_count} items", 0.8
                 
-        if "compare" in task_description.lower():
+        if "compare" in task_lower:
             # For comparison tasks, look for comparison language
-            comparison_terms = ["whereas", "while", "in contrast", "on the other hand", 
-                               "however", "compared to", "better than", "worse than"]
-            for term in comparison_terms:
-                if term in current_response.lower():
-                    return True, f"Comparison completed (contains term: '{term}')", 0.8
+            term = _first_indicator(_RE_COMPARISON_TERM, _COMPARISON_TERMS, response_lower)
+            if term:
+                return True, f"Comparison completed (contains term: '{term}')", 0.8
                     
         # Default: task not yet complete
         # Calculate completion confidence
@@ -178,21 +277,7 @@ class TaskEvaluator:
         
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from text."""
-        # Remove common words and punctuation
-        common_words = ["the", "and", "a", "an", "in", "on", "at", "of", "to", "for", 
-                      "with", "by", "about", "like", "through", "over", "before", "after",
-                      "between", "under", "during", "regarding", "into"]
-        
-        # Extract single words
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [word for word in words if len(word) > 3 and word not in common_words]
-        
-        # Extract multi-word phrases (2-3 words)
-        phrases = re.findall(r'\b\w+\s+\w+(?:\s+\w+)?\b', text.lower())
-        keywords.extend([phrase for phrase in phrases if len(phrase) > 10])
-        
-        # Ensure uniqueness and return
-        return list(set(keywords))
+        return list(_task_keywords(text))
     
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -202,11 +287,7 @@ class TaskEvaluator:
         with word embeddings, but this is a simple version for demonstration.
         """
         # Convert to sets of words for basic overlap calculation
-        words1 = set(re.findall(r'\b\w+\b', text1.lower()))
-        words2 = set(re.findall(r'\b\w+\b', text2.lower()))
-        
-        # Calculate Jaccard similarity (intersection over union)
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / max(1, union)
\ No newline at end of file
+        return _token_similarity(
+            frozenset(_RE_WORD.findall(text1.lower())),
+            frozenset(_RE_WORD.findall(text2.lower()))
+        )
\ No newline at end of file
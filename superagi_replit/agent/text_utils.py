@@ -0,0 +1,25 @@
+"""
+Text helpers shared by the task completion evaluators.
+"""
+import re
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _word_pattern(min_length: int) -> "re.Pattern":
+    """Compile the pattern for ASCII words of at least min_length letters."""
+    return re.compile(r"\b[a-zA-Z]{%d,}\b" % min_length)
+
+
+def word_tokens(text: str, min_length: int = 3) -> frozenset:
+    """
+    Get the distinct ASCII words of a text that have at least min_length letters.
+
+    Args:
+        text: Text to tokenize (callers pass it already lowercased)
+        min_length: Minimum word length
+
+    Returns:
+        Set of words
+    """
+    return frozenset(_word_pattern(min_length).findall(text))
@@ -5,18 +5,28 @@ import logging
 import os
 import sys
 
-# Create logs directory if it doesn't exist
-os.makedirs("logs", exist_ok=True)
+
+class _LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and opens the file on the first record."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        # Create logs directory if it doesn't exist
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.FileHandler("logs/superagi.log"),
+        _LazyFileHandler("logs/superagi.log"),
         logging.StreamHandler(sys.stdout)
     ]
 )
 
 # Create logger
-logger = logging.getLogger("superagi")
\ No newline at end of file
+logger = logging.getLogger("superagi")
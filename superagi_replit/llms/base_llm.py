@@ -2,7 +2,7 @@
 Base LLM class for SuperAGI.
 """
 from abc import ABC, abstractmethod
-from typing import List, Any, Dict, Optional, Union
+from typing import Iterator, List, Any, Dict, Optional, Union
 
 
 class BaseLlm(ABC):
@@ -11,6 +11,10 @@ class BaseLlm(ABC):
         """Generate a chat completion for the given prompt."""
         pass
 
+    def stream_chat_completion(self, prompt: Union[str, List[Dict[str, str]]]) -> Iterator[str]:
+        """Generate a chat completion, yielding text as it is produced (the whole response by default)."""
+        yield self.chat_completion(prompt)
+
     @abstractmethod
     def get_source(self) -> str:
         """Get the source of the LLM."""
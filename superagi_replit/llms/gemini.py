@@ -2,20 +2,52 @@
 Gemini LLM implementation for SuperAGI, making direct calls to Google Gemini API.
 """
 import json
+import time
+import random
+import logging
+import threading
+import traceback
+import email.utils
 import requests
-import itertools
-from typing import List, Dict, Union
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from requests.adapters import HTTPAdapter
+from typing import Any, Iterator, List, Dict, Optional, Tuple, Union
+from tenacity import retry, stop_after_attempt, retry_if_exception_type
 
 # Assuming logger is correctly set up in this path.
 from superagi_replit.lib.logger import logger
 from superagi_replit.llms.base_llm import BaseLlm
+from superagi_replit.llms.llm_cache import LLMCache, response_cache
+
+# orjson serializes and parses request/response bodies several times faster than the
+# stdlib json; fall back to json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Constants from the original file (or sensible defaults)
 MAX_RETRY_ATTEMPTS = 3
 MIN_WAIT = 2  # seconds
 MAX_WAIT = 20  # seconds
 
+# Smoothing factor for each key's rate-limit (HTTP 429) rate
+RATE_LIMIT_EWMA_ALPHA = 0.3
+
+# Smoothing factor for each key's response latency
+LATENCY_EWMA_ALPHA = 0.2
+
+# Safety settings sent with every request (never mutated, so shared by all payloads)
+_SAFETY_SETTINGS = (
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+)
+
+# Connection pool sizes for the shared Gemini HTTP session
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
 # --- Direct API Key Embedding ---
 # Using a selection of 15 keys as provided by the user.
 EMBEDDED_GEMINI_API_KEYS = [
@@ -30,7 +62,137 @@ EMBEDDED_GEMINI_API_KEYS = [
     # Add more keys here from your list if desired, ensuring they are unique.
 ]
 
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a JSON request body to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body (orjson.JSONDecodeError subclasses json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class GeminiRateLimitError(ValueError):
+    """Raised when a key is rate limited (HTTP 429), carrying the server's Retry-After hint."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _ApiKeyPool:
+    """
+    Rotates through API keys, skipping keys that are cooling down after a 429.
+
+    Each key tracks when it may next be used and an EWMA of how often it has
+    been rate limited, so keys that keep getting throttled cool down for longer.
+    Among the least recently used half of the usable keys, the one with the
+    lowest latency EWMA is handed out, so load still spreads over all keys.
+    """
+
+    def __init__(self, api_keys: List[str]):
+        self._lock = threading.Lock()
+        # Rotation order; a key moves to the back once it has been handed out
+        self._order = list(api_keys)
+        self._next_available_at = {key: 0.0 for key in api_keys}
+        self._rate_limit_ewma = {key: 0.0 for key in api_keys}
+        # Keys start at zero latency, so each is tried before the measurements take over
+        self._latency_ewma = {key: 0.0 for key in api_keys}
+
+    def acquire(self) -> str:
+        """Return the fastest recently unused key that is usable now, or else the soonest usable one."""
+        with self._lock:
+            now = time.monotonic()
+            usable = [k for k in self._order if self._next_available_at[k] <= now]
+            if usable:
+                candidates = usable[:max(1, len(usable) // 2)]
+                key = min(candidates, key=self._latency_ewma.__getitem__)
+            else:
+                key = min(self._order, key=self._next_available_at.__getitem__)
+            self._order.remove(key)
+            self._order.append(key)
+            return key
+
+    def report_success(self, key: str, latency: float) -> None:
+        """
+        Record a successful call.
+
+        Args:
+            key: The API key that was used
+            latency: Seconds until the response (or, when streaming, its headers) arrived
+        """
+        with self._lock:
+            self._rate_limit_ewma[key] *= 1 - RATE_LIMIT_EWMA_ALPHA
+            previous = self._latency_ewma[key]
+            self._latency_ewma[key] = latency if previous == 0.0 else (
+                (1 - LATENCY_EWMA_ALPHA) * previous + LATENCY_EWMA_ALPHA * latency)
+
+    def report_rate_limited(self, key: str, retry_after: Optional[float]) -> None:
+        """
+        Put a rate-limited key on cooldown.
+
+        Args:
+            key: The API key that received a 429
+            retry_after: Seconds from the Retry-After header, if the server sent one
+        """
+        with self._lock:
+            ewma = RATE_LIMIT_EWMA_ALPHA + (1 - RATE_LIMIT_EWMA_ALPHA) * self._rate_limit_ewma[key]
+            self._rate_limit_ewma[key] = ewma
+            if retry_after is None:
+                # No hint from the server: keys throttled more often wait longer
+                retry_after = random.uniform(MIN_WAIT, MIN_WAIT + (MAX_WAIT - MIN_WAIT) * ewma)
+            self._next_available_at[key] = time.monotonic() + retry_after
+
+    def wait_time(self) -> float:
+        """Seconds until at least one key is usable again."""
+        with self._lock:
+            return max(0.0, min(self._next_available_at.values()) - time.monotonic())
+
+
+def _wait_before_retry(retry_state) -> float:
+    """Wait for the next usable key after a 429, or back off with jitter after other failures."""
+    exception = retry_state.outcome.exception()
+    if isinstance(exception, GeminiRateLimitError):
+        # Another key is usually available right away; only wait if every key is cooling down
+        return retry_state.args[0].key_pool.wait_time()
+    # Truncated exponential backoff with jitter
+    return random.uniform(MIN_WAIT, min(MAX_WAIT, MIN_WAIT * 2 ** retry_state.attempt_number))
+
+
+def _build_session() -> requests.Session:
+    """Create an HTTP session that keeps connections to the Gemini API alive between calls."""
+    session = requests.Session()
+    # Retries are driven by tenacity, so the adapter itself never retries
+    session.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0))
+    return session
+
+
 class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing SuperAGI code
+    # Shared by all instances: each Agent builds its own proxy, but they all talk to the same host
+    _session = _build_session()
+    # Rate limits apply per key, so cooldown state is shared by all instances too
+    _key_pool = _ApiKeyPool(EMBEDDED_GEMINI_API_KEYS)
+
     def __init__(self, model="gemini-1.5-pro", temperature=0.7, max_tokens=4096,
                  top_p=1.0, frequency_penalty=0, presence_penalty=0): # Args like frequency/presence_penalty are not directly used by Gemini
         self.model = model
@@ -42,8 +204,18 @@ class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing
         if not self.api_keys:
             logger.error("CRITICAL: No API keys embedded for Gemini LLM.")
             raise ValueError("CRITICAL: No API keys embedded for Gemini LLM.")
-        self.key_iterator = itertools.cycle(self.api_keys)
+        self.key_pool = self._key_pool
         self.base_gemini_url = "https://generativelanguage.googleapis.com/v1beta/models"
+
+        # Request pieces that only depend on the constructor arguments are built once
+        model_path = self.model if self.model.startswith("models/") else f"models/{self.model}"
+        self._url_prefix = f"{self.base_gemini_url}/{model_path}:generateContent?key="
+        self._stream_url_prefix = f"{self.base_gemini_url}/{model_path}:streamGenerateContent?alt=sse&key="
+        self._generation_config = {
+            "temperature": float(self.temperature), # Ensure correct type
+            "maxOutputTokens": int(self.max_tokens), # Ensure correct type
+            "topP": float(self.top_p) # Ensure correct type
+        }
         logger.info(f"GeminiDirectClient initialized with {len(self.api_keys)} keys. First key ends with ...{self.api_keys[0][-4:] if self.api_keys else 'N/A'}")
 
     def get_source(self) -> str:
@@ -59,25 +231,30 @@ class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing
     def verify_access_key(self) -> bool:
         return bool(self.api_keys) # Basic check; a true verification would ping the API.
 
-    @retry(
-        stop=stop_after_attempt(len(EMBEDDED_GEMINI_API_KEYS) * MAX_RETRY_ATTEMPTS if EMBEDDED_GEMINI_API_KEYS else MAX_RETRY_ATTEMPTS),
-        wait=wait_exponential(multiplier=1, min=MIN_WAIT, max=MAX_WAIT),
-        retry=retry_if_exception_type((requests.exceptions.RequestException, json.JSONDecodeError, ValueError)),
-        reraise=True
-    )
-    def chat_completion(self, prompt: Union[str, List[Dict[str, str]]]) -> str:
-        current_api_key = next(self.key_iterator)
-        logger.info(f"Attempting Gemini API call with key ending ...{current_api_key[-4:]}")
+    def _build_request(self, prompt: Union[str, List[Dict[str, str]]]) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Convert a prompt into a Gemini request payload.
 
-        model_path = self.model if self.model.startswith("models/") else f"models/{self.model}"
-        url = f"{self.base_gemini_url}/{model_path}:generateContent?key={current_api_key}"
+        Args:
+            prompt: A prompt string or a list of chat messages
 
+        Returns:
+            Tuple of (payload, cache key), where the cache key is None for requests that
+            must not be cached, or None if the prompt has no content to send
+        """
         gemini_contents = []
+        # Leading system messages are the static preamble of a conversation. Sending them as the
+        # system instruction keeps the request prefix byte-identical across turns, so the
+        # provider-side prompt cache can hit (generation config must also stay unchanged).
+        system_texts = []
         if isinstance(prompt, str):
             gemini_contents.append({"role": "user", "parts": [{"text": prompt}]})
         else:
             for message in prompt:
                 role = message.get("role", "user").lower()
+                if role == "system" and not gemini_contents:
+                    system_texts.append(message.get("content", ""))
+                    continue
                 gemini_role = "model" if role in ["assistant", "system"] else "user" # Map system/assistant to model
                 gemini_contents.append({"role": gemini_role, "parts": [{"text": message.get("content", "")}]})
 
@@ -85,30 +262,60 @@ class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing
         valid_contents = [c for c in gemini_contents if c.get("parts") and c["parts"][0].get("text", "").strip()]
         if not valid_contents:
             logger.error("No valid content to send to Gemini after transformation. Original prompt was: %s", prompt)
-            return "Error: No valid content derived from prompt to send to Gemini."
+            return None
+        system_instruction = "\n\n".join(text for text in system_texts if text.strip())
+
+        generation_config = self._generation_config
 
         payload = {
             "contents": valid_contents,
-            "generationConfig": {
-                "temperature": float(self.temperature), # Ensure correct type
-                "maxOutputTokens": int(self.max_tokens), # Ensure correct type
-                "topP": float(self.top_p) # Ensure correct type
-            },
-            "safetySettings": [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
+            "generationConfig": generation_config,
+            "safetySettings": _SAFETY_SETTINGS
         }
-        logger.debug(f"Sending payload to Gemini: {json.dumps(payload, indent=2)}")
+        if system_instruction:
+            payload["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+
+        # Only deterministic requests are answered from the cache
+        cache_key = None
+        if generation_config["temperature"] == 0:
+            cache_key = LLMCache.cache_key(self.model, valid_contents, generation_config, system_instruction)
+        return payload, cache_key
+
+    @retry(
+        stop=stop_after_attempt(len(EMBEDDED_GEMINI_API_KEYS) * MAX_RETRY_ATTEMPTS if EMBEDDED_GEMINI_API_KEYS else MAX_RETRY_ATTEMPTS),
+        wait=_wait_before_retry,
+        retry=retry_if_exception_type((requests.exceptions.RequestException, json.JSONDecodeError, ValueError)),
+        reraise=True
+    )
+    def chat_completion(self, prompt: Union[str, List[Dict[str, str]]]) -> str:
+        request = self._build_request(prompt)
+        if request is None:
+            return "Error: No valid content derived from prompt to send to Gemini."
+        payload, cache_key = request
+
+        if cache_key is not None:
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Returning cached Gemini response")
+                return cached_response
+
+        current_api_key = self.key_pool.acquire()
+        logger.info(f"Attempting Gemini API call with key ending ...{current_api_key[-4:]}")
+
+        url = self._url_prefix + current_api_key
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending payload to Gemini: {json.dumps(payload, indent=2)}")
 
         try:
-            response = requests.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=120) # Increased timeout
+            started_at = time.monotonic()
+            response = self._session.post(url, data=_dumps(payload), headers={"Content-Type": "application/json"}, timeout=120) # Increased timeout
+            latency = time.monotonic() - started_at
             response.raise_for_status()
 
-            result = response.json()
-            logger.debug(f"Received response from Gemini: {json.dumps(result, indent=2)}")
+            result = _loads(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Received response from Gemini: {json.dumps(result, indent=2)}")
 
             if "candidates" in result and result["candidates"]:
                 candidate = result["candidates"][0]
@@ -127,6 +334,9 @@ class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing
                          logger.warning(f"Empty text from Gemini with finishReason: {finish_reason} (key ...{current_api_key[-4:]})")
                          return f"Received empty response from Gemini (finish reason: {finish_reason})."
                     logger.info(f"Successfully received response from Gemini (key ...{current_api_key[-4:]})")
+                    self.key_pool.report_success(current_api_key, latency)
+                    if cache_key is not None:
+                        response_cache.set(cache_key, text_response)
                     return text_response
                 else:
                     logger.error(f"Unexpected Gemini response structure (no content/parts) (key ...{current_api_key[-4:]}): {result}")
@@ -137,21 +347,123 @@ class GeminiProxy(BaseLlm): # Keeping class name for compatibility with existing
                 error_message = error_details.get('message', str(error_details))
                 error_code = error_details.get('code')
                 logger.error(f"Error from Gemini API (key ...{current_api_key[-4:]}): {error_message} (Code: {error_code})")
-                if error_code in [400, 401, 403, 429]:
+                if error_code == 429:
+                    self.key_pool.report_rate_limited(current_api_key, None)
+                    raise GeminiRateLimitError(f"Gemini API rate limit (key ...{current_api_key[-4:]}): {error_message}")
+                if error_code in [400, 401, 403]:
                     raise ValueError(f"Gemini API error (key ...{current_api_key[-4:]}, code {error_code}): {error_message}") # Retry for these
                 return f"Error from Gemini API: {error_message}" # Don't retry for others
             else:
                 logger.error(f"No candidates or error field in Gemini response (key ...{current_api_key[-4:]}): {result}")
                 raise ValueError(f"No candidates or error field in Gemini response for key ...{current_api_key[-4:]}")
 
+        except GeminiRateLimitError:
+            raise # Retry with the next usable key
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error calling Gemini API (key ...{current_api_key[-4:]}): Status {e.response.status_code}, Response: {e.response.text}")
-            if e.response.status_code in [400, 401, 403, 429]: # Likely key-related or quota
+            if e.response.status_code == 429: # Quota exhausted for this key
+                retry_after = _parse_retry_after(e.response.headers.get("Retry-After"))
+                self.key_pool.report_rate_limited(current_api_key, retry_after)
+                raise GeminiRateLimitError(f"HTTP Error 429 (key ...{current_api_key[-4:]}). Retrying.", retry_after)
+            if e.response.status_code in [400, 401, 403]: # Likely key-related
                 raise ValueError(f"HTTP Error {e.response.status_code} (key ...{current_api_key[-4:]}). Retrying.")
             raise # Reraise other HTTP errors
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error calling Gemini API (key ...{current_api_key[-4:]}): {str(e)}")
             raise # Retry for network issues
+        except json.JSONDecodeError as e:
+            # Raised by _loads for malformed or truncated bodies (orjson's error subclasses it)
+            logger.error(f"Invalid JSON in Gemini response (key ...{current_api_key[-4:]}): {str(e)}")
+            raise # Retry with the next key
         except Exception as e:
             logger.error(f"Unexpected error in Gemini chat_completion (key ...{current_api_key[-4:]}): {str(e)} - {traceback.format_exc()}")
             raise ValueError(f"Unexpected error: {str(e)}")
+
+    @retry(
+        stop=stop_after_attempt(len(EMBEDDED_GEMINI_API_KEYS) * MAX_RETRY_ATTEMPTS if EMBEDDED_GEMINI_API_KEYS else MAX_RETRY_ATTEMPTS),
+        wait=_wait_before_retry,
+        retry=retry_if_exception_type((requests.exceptions.RequestException, json.JSONDecodeError, ValueError)),
+        reraise=True
+    )
+    def _open_stream(self, payload: Dict[str, Any]) -> Tuple[requests.Response, str, float]:
+        """
+        Start a streaming Gemini request, retrying until a key answers successfully.
+
+        Args:
+            payload: Request payload from _build_request()
+
+        Returns:
+            Tuple of (open streaming response, API key used, seconds until the headers arrived)
+        """
+        current_api_key = self.key_pool.acquire()
+        logger.info(f"Attempting Gemini streaming call with key ending ...{current_api_key[-4:]}")
+
+        url = self._stream_url_prefix + current_api_key
+
+        started_at = time.monotonic()
+        response = self._session.post(url, data=_dumps(payload), headers={"Content-Type": "application/json"}, stream=True, timeout=120)
+        if response.ok:
+            return response, current_api_key, time.monotonic() - started_at
+
+        logger.error(f"HTTP error calling Gemini streaming API (key ...{current_api_key[-4:]}): Status {response.status_code}, Response: {response.text}")
+        if response.status_code == 429: # Quota exhausted for this key
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            self.key_pool.report_rate_limited(current_api_key, retry_after)
+            raise GeminiRateLimitError(f"HTTP Error 429 (key ...{current_api_key[-4:]}). Retrying.", retry_after)
+        if response.status_code in [400, 401, 403]: # Likely key-related
+            raise ValueError(f"HTTP Error {response.status_code} (key ...{current_api_key[-4:]}). Retrying.")
+        response.raise_for_status()
+
+    def stream_chat_completion(self, prompt: Union[str, List[Dict[str, str]]]) -> Iterator[str]:
+        """
+        Generate a chat completion, yielding text as Gemini produces it.
+
+        Only opening the stream is retried: once text has been yielded, errors
+        propagate to the caller rather than restarting the response.
+
+        Args:
+            prompt: A prompt string or a list of chat messages
+
+        Yields:
+            Chunks of the response text
+        """
+        request = self._build_request(prompt)
+        if request is None:
+            yield "Error: No valid content derived from prompt to send to Gemini."
+            return
+        payload, cache_key = request
+
+        if cache_key is not None:
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Returning cached Gemini response")
+                yield cached_response
+                return
+
+        response, current_api_key, latency = self._open_stream(payload)
+        chunks = []
+        with response:
+            for line in response.iter_lines():
+                # Server-sent events: each response chunk arrives on a "data: {...}" line
+                if not line.startswith(b"data:"):
+                    continue
+                result = _loads(line[5:])
+                if "error" in result:
+                    error_details = result["error"]
+                    raise ValueError(f"Gemini API error during stream (key ...{current_api_key[-4:]}): {error_details.get('message', error_details)}")
+                if not result.get("candidates"):
+                    continue
+
+                candidate = result["candidates"][0]
+                if candidate.get("finishReason") == "SAFETY":
+                    logger.warning(f"Gemini stream filtered due to safety settings (key ...{current_api_key[-4:]}). Candidate: {candidate}")
+                parts = candidate.get("content", {}).get("parts")
+                text = parts[0].get("text", "") if parts else ""
+                if text:
+                    chunks.append(text)
+                    yield text
+
+        logger.info(f"Successfully streamed response from Gemini (key ...{current_api_key[-4:]})")
+        self.key_pool.report_success(current_api_key, latency)
+        if cache_key is not None and chunks:
+            response_cache.set(cache_key, "".join(chunks))
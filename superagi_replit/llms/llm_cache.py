@@ -0,0 +1,117 @@
+"""
+Response cache for LLM calls.
+
+Identical deterministic requests (same model, contents and generation config)
+are answered from memory instead of going back to the provider.
+"""
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default time-to-live for cached responses
+DEFAULT_TTL_SECONDS = 3600
+
+# Maximum number of responses kept in memory
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class LLMCache:
+    """
+    Thread-safe, in-memory exact-match cache of LLM responses.
+
+    Entries expire after a TTL and the least recently used entry is evicted
+    once the cache is full.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Default time-to-live for a cached response
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(model: str, contents: List[Dict[str, Any]], generation_config: Dict[str, Any],
+                  system_instruction: str = "") -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name
+            contents: Request contents sent to the provider
+            generation_config: Sampling parameters of the request
+            system_instruction: System instruction sent with the request, if any
+
+        Returns:
+            Hex digest identifying the request
+        """
+        request = {
+            "model": model,
+            "system_instruction": system_instruction,
+            "contents": contents,
+            "generation_config": generation_config,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from cache_key()
+            response: Response text to cache
+            ttl_seconds: Time-to-live for this entry (defaults to the cache TTL)
+        """
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current cache size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+# Shared cache used by the LLM clients
+response_cache = LLMCache()
@@ -2,8 +2,10 @@
 Main entry point for the SuperAGI application.
 """
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Depends, Request, Query, Body
 from pydantic import BaseModel, Field
@@ -12,6 +14,7 @@ from sqlalchemy.orm import Session
 from superagi_replit.agent.agent import Agent
 from superagi_replit.agent.task_completion import TaskCompletion
 from superagi_replit.lib.logger import logger
+from superagi_replit.llms.llm_cache import response_cache
 from superagi_replit.models.agent import Agent as AgentModel
 from superagi_replit.models.agent_execution import AgentExecution
 from superagi_replit.models.agent_execution_feed import AgentExecutionFeed
@@ -27,6 +30,50 @@ Base.metadata.create_all(bind=engine)
 # Create FastAPI app
 app = FastAPI(title="SuperAGI Simplified", version="0.1.0")
 
+# Maximum number of executions whose goals and feeds are kept in memory
+MAX_CACHED_EXECUTIONS = 256
+
+# Goals never change once an execution exists
+_goals_cache: "OrderedDict[int, Tuple[str, ...]]" = OrderedDict()
+# Feeds are append-only: keep what was loaded (with the last feed ID) and fetch only newer rows
+_feeds_cache: "OrderedDict[int, Tuple[int, List[Tuple[str, str]]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_put(cache: OrderedDict, key: int, value: Any) -> None:
+    """Store a value in an execution cache, evicting the least recently used execution."""
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > MAX_CACHED_EXECUTIONS:
+            cache.popitem(last=False)
+
+
+def _get_execution_goals(db: Session, execution_id: int) -> Tuple[str, ...]:
+    """Get the goals of an execution, querying the database only the first time."""
+    with _cache_lock:
+        goals = _goals_cache.get(execution_id)
+    if goals is None:
+        rows = db.query(AgentExecutionGoal.goal).filter(AgentExecutionGoal.agent_execution_id == execution_id).all()
+        goals = tuple(row.goal for row in rows)
+        _cache_put(_goals_cache, execution_id, goals)
+    return goals
+
+
+def _get_execution_feeds(db: Session, execution_id: int) -> List[Tuple[str, str]]:
+    """Get the (role, feed) history of an execution in insertion order, loading only feeds not seen before."""
+    with _cache_lock:
+        last_feed_id, feeds = _feeds_cache.get(execution_id, (0, []))
+    rows = db.query(AgentExecutionFeed.id, AgentExecutionFeed.role, AgentExecutionFeed.feed).filter(
+        AgentExecutionFeed.agent_execution_id == execution_id,
+        AgentExecutionFeed.id > last_feed_id
+    ).order_by(AgentExecutionFeed.id).all()
+    if rows:
+        feeds = feeds + [(str(row.role), str(row.feed)) for row in rows]
+        last_feed_id = rows[-1].id
+    _cache_put(_feeds_cache, execution_id, (last_feed_id, feeds))
+    return feeds
+
 
 # Pydantic models for API
 class AgentCreate(BaseModel):
@@ -39,8 +86,8 @@ class AgentRead(BaseModel):
     id: int
     name: str
     description: str
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 class AgentExecutionCreate(BaseModel):
@@ -53,8 +100,8 @@ class AgentExecutionRead(BaseModel):
     id: int
     agent_id: int
     status: str
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     current_step: int
 
 
@@ -63,7 +110,7 @@ class AgentExecutionFeedRead(BaseModel):
     role: str
     feed: str
     feed_type: Optional[str] = None
-    created_at: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 
 class AgentExecutionQuery(BaseModel):
@@ -81,44 +128,39 @@ async def read_root():
 async def create_agent(agent_data: AgentCreate, db: Session = Depends(get_db)):
     """Create a new agent."""
     try:
-        # Create timestamp
-        now = datetime.now().isoformat()
-        
         # Create new agent model
         agent = AgentModel(
             name=agent_data.name,
-            description=agent_data.description,
-            created_at=now,
-            updated_at=now
+            description=agent_data.description
         )
         
-        # Add and commit to DB
+        # Flush rather than commit, so everything below lands in one transaction
         db.add(agent)
-        db.commit()
-        db.refresh(agent)
+        db.flush()
         
-        # Create agent goals
-        for goal in agent_data.goals:
-            execution = AgentExecution(
+        # Create an execution per goal, flushed together to get their IDs
+        executions = [
+            AgentExecution(
                 agent_id=agent.id,
                 status="CREATED",
-                created_at=now,
-                updated_at=now,
                 current_step=1
             )
-            db.add(execution)
-            db.commit()
-            db.refresh(execution)
-            
-            execution_goal = AgentExecutionGoal(
+            for _ in agent_data.goals
+        ]
+        db.add_all(executions)
+        db.flush()
+        
+        # Create agent goals
+        db.add_all([
+            AgentExecutionGoal(
                 agent_execution_id=execution.id,
-                goal=goal,
-                created_at=now,
-                updated_at=now
+                goal=goal
             )
-            db.add(execution_goal)
+            for execution, goal in zip(executions, agent_data.goals)
+        ])
         
         db.commit()
+        db.refresh(agent)
         
         return agent
         
@@ -145,7 +187,7 @@ async def get_agent(agent_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/agent-execution", tags=["Agent Execution"])
-async def execute_agent(execution_data: AgentExecutionCreate, db: Session = Depends(get_db)):
+def execute_agent(execution_data: AgentExecutionCreate, db: Session = Depends(get_db)):
     """Execute an agent with a user query."""
     try:
         # Get the agent
@@ -154,12 +196,9 @@ async def execute_agent(execution_data: AgentExecutionCreate, db: Session = Depe
             raise HTTPException(status_code=404, detail=f"Agent {execution_data.agent_id} not found")
         
         # Create an execution record
-        now = datetime.now().isoformat()
         execution = AgentExecution(
             agent_id=agent_model.id,
             status="RUNNING",
-            created_at=now,
-            updated_at=now,
             current_step=1
         )
         db.add(execution)
@@ -182,25 +221,26 @@ async def execute_agent(execution_data: AgentExecutionCreate, db: Session = Depe
         agent.add_tool(WebSearchTool())
         agent.add_tool(WebScraperTool())
         
+        # End the transaction so the connection goes back to the pool during the LLM calls
+        db.commit()
+        
         # Run the agent with specified max iterations
         logger.info(f"Starting agent execution with max_iterations: {execution_data.max_iterations}")
         response = agent.run(execution_data.user_input, max_iterations=execution_data.max_iterations)
         
         # Save the execution feed
-        for msg in agent.get_chat_history():
-            feed = AgentExecutionFeed(
+        db.add_all([
+            AgentExecutionFeed(
                 agent_execution_id=execution.id,
                 role=msg["role"],
                 feed=msg["content"],
-                feed_type="TEXT",
-                created_at=now,
-                updated_at=now
+                feed_type="TEXT"
             )
-            db.add(feed)
+            for msg in agent.get_chat_history()
+        ])
         
-        # Update execution status
+        # Update execution status (updated_at is set by the database)
         execution.status = "COMPLETED"
-        execution.updated_at = datetime.now().isoformat()
         db.commit()
         
         return {
@@ -225,7 +265,7 @@ async def get_execution_feed(execution_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/agent-query", tags=["Agent Execution"])
-async def query_agent(query_data: AgentExecutionQuery, db: Session = Depends(get_db)):
+def query_agent(query_data: AgentExecutionQuery, db: Session = Depends(get_db)):
     """Send a query to a running agent execution."""
     try:
         # Get the execution
@@ -239,9 +279,7 @@ async def query_agent(query_data: AgentExecutionQuery, db: Session = Depends(get
             raise HTTPException(status_code=404, detail=f"Agent {execution.agent_id} not found")
         
         # Get agent goals
-        agent_goals = []
-        for goal in db.query(AgentExecutionGoal).filter(AgentExecutionGoal.agent_execution_id == execution.id).all():
-            agent_goals.append(goal.goal)
+        agent_goals = list(_get_execution_goals(db, execution.id))
         
         # Create the agent
         agent = Agent(
@@ -254,31 +292,31 @@ async def query_agent(query_data: AgentExecutionQuery, db: Session = Depends(get
         agent.add_tool(WebSearchTool())
         agent.add_tool(WebScraperTool())
         
-        # Load previous chat history
-        feeds = db.query(AgentExecutionFeed).filter(AgentExecutionFeed.agent_execution_id == execution.id).all()
-        for feed in feeds:
-            agent.add_message(str(feed.role), str(feed.feed))
+        # Load previous chat history in insertion order, so the replayed prefix is identical on every query
+        feeds = _get_execution_feeds(db, execution.id)
+        for role, content in feeds:
+            agent.add_message(role, content)
+        
+        # End the transaction so the connection goes back to the pool during the LLM calls
+        db.commit()
         
         # Run the agent with the new query using task completion
         logger.info(f"Continuing agent execution with query: {query_data.user_input}")
         response = agent.run(query_data.user_input, max_iterations=5)
         
         # Save the new execution feed
-        now = datetime.now().isoformat()
-        for msg in agent.get_chat_history()[len(feeds):]:
-            feed = AgentExecutionFeed(
+        db.add_all([
+            AgentExecutionFeed(
                 agent_execution_id=execution.id,
                 role=msg["role"],
                 feed=msg["content"],
-                feed_type="TEXT",
-                created_at=now,
-                updated_at=now
+                feed_type="TEXT"
             )
-            db.add(feed)
+            for msg in agent.get_chat_history()[len(feeds):]
+        ])
         
-        # Update execution
+        # Update execution (updated_at is set by the database)
         execution.current_step += 1
-        execution.updated_at = now
         db.commit()
         
         return {
@@ -293,6 +331,12 @@ async def query_agent(query_data: AgentExecutionQuery, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=f"Error querying agent: {str(e)}")
 
 
+@app.get("/cache/stats", tags=["Cache"])
+async def get_cache_stats():
+    """Get hit/miss statistics for the LLM response cache."""
+    return response_cache.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     
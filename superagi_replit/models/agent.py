@@ -1,7 +1,7 @@
 """
 Agent model for SuperAGI.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func
 from sqlalchemy.orm import relationship
 
 from superagi_replit.models.db import Base
@@ -18,9 +18,9 @@ class Agent(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(String(255), nullable=True)
-    updated_at = Column(String(255), nullable=True)
-    is_deleted = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    is_deleted = Column(Boolean, default=False, index=True)
     
     # Relationships
     executions = relationship("AgentExecution", back_populates="agent", passive_deletes=True)
@@ -1,7 +1,7 @@
 """
 Agent Execution model for SuperAGI.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
 
 from superagi_replit.models.db import Base
@@ -16,12 +16,12 @@ class AgentExecution(Base):
     __tablename__ = "agent_executions"
     
     id = Column(Integer, primary_key=True, index=True)
-    agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False)
+    agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=True)
     status = Column(String(255), nullable=True, default="CREATED")
     last_execution_time = Column(String(255), nullable=True)
-    created_at = Column(String(255), nullable=True)
-    updated_at = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     current_step = Column(Integer, default=1)
     
     # Relationships
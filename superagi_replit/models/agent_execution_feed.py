@@ -1,7 +1,7 @@
 """
 Agent Execution Feed model for SuperAGI.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, DateTime, func
 from sqlalchemy.orm import relationship
 
 from superagi_replit.models.db import Base
@@ -14,14 +14,16 @@ class AgentExecutionFeed(Base):
     Represents a message or action in the agent execution feed.
     """
     __tablename__ = "agent_execution_feeds"
+    # Covers lookups by execution and replaying its feed in insertion order
+    __table_args__ = (Index("ix_feed_exec_id", "agent_execution_id", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     agent_execution_id = Column(Integer, ForeignKey("agent_executions.id", ondelete="CASCADE"), nullable=False)
     role = Column(String(255), nullable=True)
     feed = Column(Text, nullable=True)
     feed_type = Column(String(255), nullable=True)
-    created_at = Column(String(255), nullable=True)
-    updated_at = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     execution = relationship("AgentExecution", back_populates="feeds")
@@ -1,7 +1,7 @@
 """
 Agent Execution Goal model for SuperAGI.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
 
 from superagi_replit.models.db import Base
@@ -16,10 +16,10 @@ class AgentExecutionGoal(Base):
     __tablename__ = "agent_execution_goals"
     
     id = Column(Integer, primary_key=True, index=True)
-    agent_execution_id = Column(Integer, ForeignKey("agent_executions.id", ondelete="CASCADE"), nullable=False)
+    agent_execution_id = Column(Integer, ForeignKey("agent_executions.id", ondelete="CASCADE"), nullable=False, index=True)
     goal = Column(Text, nullable=False)
-    created_at = Column(String(255), nullable=True)
-    updated_at = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     execution = relationship("AgentExecution", back_populates="goals")
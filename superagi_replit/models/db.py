@@ -2,13 +2,30 @@
 Database connection and base model setup.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from superagi_replit.config import get_config
 
+# Connection pool settings, sized for requests served from FastAPI's threadpool
+POOL_SIZE = 20
+MAX_OVERFLOW = 40
+POOL_RECYCLE = 1800  # seconds
+
+def _engine_options(url: str) -> dict:
+    """Get pool options for the database URL (SQLite uses its own pooling)."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": POOL_RECYCLE,
+    }
+
 # Create database engine
-engine = create_engine(get_config("DATABASE_URL"))
+engine = create_engine(get_config("DATABASE_URL"), **_engine_options(get_config("DATABASE_URL")))
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,7 +1,7 @@
 """
 Tool model for SuperAGI.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func
 
 from superagi_replit.models.db import Base
 
@@ -21,8 +21,8 @@ class Tool(Base):
     class_name = Column(String(255), nullable=True)
     file_name = Column(String(255), nullable=True)
     built_in = Column(Boolean, default=False)
-    created_at = Column(String(255), nullable=True)
-    updated_at = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     def __repr__(self):
         return f"<Tool {self.name}>"
\ No newline at end of file
@@ -1,12 +1,35 @@
 """
 Base Tool class for SuperAGI.
 """
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Type, get_type_hints
 
 from pydantic import BaseModel
 
 
+@functools.lru_cache(maxsize=None)
+def _args_schema_json(args_schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Generate the JSON schema of an argument model once (callers must not mutate it)."""
+    return args_schema.schema()
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_schema(tool_class: type) -> Dict[str, Any]:
+    """Build the schema of a tool class once, from a throwaway instance."""
+    instance = tool_class()
+    schema = {
+        "name": instance.name,
+        "description": instance.description
+    }
+    
+    if hasattr(instance, 'args_schema') and instance.args_schema:
+        schema["args_schema"] = _args_schema_json(instance.args_schema)
+        
+    return schema
+
+
 class BaseTool(ABC):
     """
     Base class for all tools in SuperAGI.
@@ -33,6 +56,21 @@ class BaseTool(ABC):
         """
         pass
     
+    async def aexecute(self, *args, **kwargs) -> str:
+        """
+        Execute the tool from async code without blocking the event loop.
+        
+        The blocking execute() (network I/O and retry backoff) runs in a worker thread.
+        
+        Args:
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+            
+        Returns:
+            String result of the tool execution
+        """
+        return await asyncio.to_thread(self.execute, *args, **kwargs)
+    
     def get_tool_config(self) -> Dict[str, Any]:
         """
         Get the tool configuration.
@@ -46,7 +84,7 @@ class BaseTool(ABC):
         }
         
         if hasattr(self, 'args_schema') and self.args_schema:
-            config["args_schema"] = self.args_schema.schema()
+            config["args_schema"] = _args_schema_json(self.args_schema)
         
         return config
         
@@ -58,13 +96,4 @@ class BaseTool(ABC):
         Returns:
             Dictionary containing tool schema
         """
-        instance = cls()
-        schema = {
-            "name": instance.name,
-            "description": instance.description
-        }
-        
-        if hasattr(instance, 'args_schema') and instance.args_schema:
-            schema["args_schema"] = instance.args_schema.schema()
-            
-        return schema
\ No newline at end of file
+        return dict(_tool_schema(cls))
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Shared HTTP session for the web tools.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool sizes: number of hosts kept and connections per host
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+
+# Retries for scraped hosts (idempotent requests only)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 2
+RETRY_STATUSES = (502, 503, 504)
+
+
+def _build_session() -> requests.Session:
+    """Create a session that keeps connections alive between tool calls."""
+    session = requests.Session()
+    retries = Retry(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, status_forcelist=RETRY_STATUSES)
+    session.mount("http://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retries))
+    session.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retries))
+    # The local proxies are tried first, so a proxy that is down must fail fast to fall back
+    session.mount("http://localhost:", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0))
+    return session
+
+
+# Shared by all tool instances
+session = _build_session()
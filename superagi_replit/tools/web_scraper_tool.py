@@ -1,16 +1,125 @@
 """
 Web Scraper tool for SuperAGI.
 """
+import re
 import json
-import requests
 import time
-from typing import Dict, Any, Optional, List
+import functools
+import threading
+import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, List, Tuple
 
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from pydantic import BaseModel, Field
 
 from superagi_replit.lib.logger import logger
+from superagi_replit.llms.llm_cache import LLMCache
 from superagi_replit.tools.base_tool import BaseTool
+from superagi_replit.tools.http_session import session
+
+try:
+    import lxml  # noqa: F401 - only checked for availability
+    # C parser, much faster than the pure-Python html.parser
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Output is truncated after formatting anyway, so only this much of a page is downloaded and parsed
+MAX_PAGE_BYTES = 2_000_000
+
+# Maximum number of pages fetched at once by execute_many
+MAX_CONCURRENT_SCRAPES = 20
+
+# Content types the scraper parses
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Scraped pages are reused for a few minutes, since agent loops often revisit the same URL
+SCRAPE_CACHE_TTL_SECONDS = 300
+SCRAPE_CACHE_MAX_ENTRIES = 256
+_scrape_cache = LLMCache(max_entries=SCRAPE_CACHE_MAX_ENTRIES, ttl_seconds=SCRAPE_CACHE_TTL_SECONDS)
+
+# Parsed pages kept so that scraping a URL again at another depth skips the download and parse.
+# Entries older than SCRAPE_CACHE_TTL_SECONDS are revalidated with their ETag/Last-Modified.
+SOUP_CACHE_MAX_ENTRIES = 32
+_soup_cache: "OrderedDict[str, Tuple[float, Dict[str, str], BeautifulSoup]]" = OrderedDict()
+_soup_cache_lock = threading.Lock()
+
+# Headers sent with direct page requests, to avoid being blocked
+_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Referer': 'https://www.google.com/'
+}
+
+# Response validators remembered for a cached page, and the request headers that send them back
+_VALIDATOR_HEADERS = (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
+
+# Tags removed from every parsed page, together with everything inside them
+_REMOVED_TAGS = ("script", "style", "iframe", "nav", "footer")
+
+# Tags the content extractors read. Only tags outside all of these (head metadata) are
+# skipped while parsing; matched tags keep their subtree. The removed tags are parsed too,
+# otherwise their content would be kept without the wrapper that marks it for removal.
+_CONTENT_STRAINER = SoupStrainer(["main", "article", "div", "section", "title", "h1", "h2", "h3", "p", "ul", "ol", "li", "span",
+                                  *_REMOVED_TAGS])
+
+
+def _scrape_cache_key(url: str, max_depth: int, elements: Optional[List[str]]) -> str:
+    """Build the cache key for a scrape request."""
+    return json.dumps([url, max_depth, list(elements) if elements else None])
+
+
+# Sibling tags collected as the content of a heading's section
+_SECTION_CONTENT_TAGS = frozenset(('p', 'ul', 'ol'))
+_LIST_TAGS = frozenset(('ul', 'ol'))
+
+# Selectors handled with find/find_all: 'tag', 'tag.class', 'tag#id' (tag optional).
+# Anything else goes through the slower, but general, CSS selector engine.
+_SIMPLE_SELECTOR = re.compile(r"([\w-]*)(?:([.#])([\w-]+))?")
+
+
+def _elements_strainer(elements: List[str]) -> Optional[SoupStrainer]:
+    """Build a strainer for the tags named by element selectors, or None if a selector can match any tag."""
+    tags = set()
+    for selector in elements:
+        match = _SIMPLE_SELECTOR.fullmatch(selector)
+        if match is None or not match.group(1):
+            # Selectors like '.post', '#main' or 'article > p' are not limited to one top-level tag
+            return None
+        tags.add(match.group(1))
+    # Parse the removed tags as well, so matches inside them are removed with them
+    tags.update(_REMOVED_TAGS)
+    return SoupStrainer(list(tags))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_selector(selector: str) -> Callable[[BeautifulSoup], List[Tag]]:
+    """
+    Compile an element selector once into a function that finds its matches in a page.
+    
+    Args:
+        selector: Element selector (e.g., 'h1', 'div.content', 'article > p')
+        
+    Returns:
+        Function returning the elements of a soup matched by the selector
+    """
+    match = _SIMPLE_SELECTOR.fullmatch(selector)
+    if match is None:
+        # Compound or nested selector (e.g., div.a.b, article > p)
+        return soupsieve.compile(selector).select
+    tag, kind, name = match.groups()
+    if kind == '.':
+        # Class selector (e.g., div.content)
+        return lambda soup: soup.find_all(tag, class_=name)
+    if kind == '#':
+        # ID selector (e.g., div#main)
+        return lambda soup: [soup.find(tag, id=name)]
+    # Tag selector (e.g., h1)
+    return lambda soup: soup.find_all(selector)
 
 
 class WebScraperSchema(BaseModel):
@@ -48,6 +157,12 @@ class WebScraperTool(BaseTool):
         max_depth = min(max(1, kwargs.get("max_depth", 1)), 3)  # Between 1 and 3
         elements = kwargs.get("elements", None)
         
+        cache_key = _scrape_cache_key(url, max_depth, elements)
+        cached_content = _scrape_cache.get(cache_key)
+        if cached_content is not None:
+            logger.info(f"Returning cached content for {url}")
+            return cached_content
+        
         try:
             # First try using the proxy if available
             try:
@@ -59,7 +174,7 @@ class WebScraperTool(BaseTool):
                     "max_depth": max_depth
                 }
                 
-                response = requests.post(
+                response = session.post(
                     proxy_url,
                     json=payload,
                     headers={"Content-Type": "application/json"},
@@ -71,14 +186,18 @@ class WebScraperTool(BaseTool):
                 
                 if "text" in result and result["text"]:
                     logger.info(f"Successfully scraped {url} via proxy")
-                    return self._format_scraped_content(result["text"], url)
+                    content = self._format_scraped_content(result["text"], url)
+                    _scrape_cache.set(cache_key, content)
+                    return content
                 elif "status_code" in result and "text" in result and result["text"]:
                     # Handle fetch_url endpoint format
                     logger.info(f"Successfully scraped {url} via proxy with status {result['status_code']}")
-                    return self._format_scraped_content(result["text"], url)
+                    content = self._format_scraped_content(result["text"], url)
+                    _scrape_cache.set(cache_key, content)
+                    return content
                 else:
                     logger.warning(f"No content returned from proxy for {url}, falling back to direct scraping")
-            except (requests.RequestException, json.JSONDecodeError) as e:
+            except requests.RequestException as e:
                 logger.warning(f"Error with scrape proxy: {str(e)}, falling back to direct scraping")
             
             # Fallback to direct scraping
@@ -90,6 +209,24 @@ class WebScraperTool(BaseTool):
             logger.error(error_msg)
             return error_msg
     
+    def execute_many(self, urls: List[str], max_depth: int = 1, elements: Optional[List[str]] = None) -> List[str]:
+        """
+        Scrape several URLs concurrently.
+        
+        Args:
+            urls: URLs to scrape
+            max_depth: Maximum depth of page content to return
+            elements: Specific HTML elements to extract
+            
+        Returns:
+            Extracted content for each URL, in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(len(urls), MAX_CONCURRENT_SCRAPES)) as executor:
+            return list(executor.map(lambda url: self.execute(url=url, max_depth=max_depth, elements=elements), urls))
+    
     def _direct_scrape(self, url: str, max_depth: int = 1, elements: Optional[List[str]] = None) -> str:
         """
         Perform direct web scraping using requests and BeautifulSoup.
@@ -103,34 +240,12 @@ class WebScraperTool(BaseTool):
             Extracted content as a string
         """
         try:
-            # Set up proper headers to avoid blocking
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Referer': 'https://www.google.com/'
-            }
-            
-            # Try to fetch the page with retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    break
-                except requests.RequestException as e:
-                    logger.warning(f"Scraping attempt {attempt+1} failed: {str(e)}")
-                    if attempt < max_retries - 1:
-                        time.sleep(2 * (attempt + 1))  # Exponential backoff
-                    else:
-                        raise
-            
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unnecessary elements
-            for script in soup(["script", "style", "iframe", "nav", "footer"]):
-                script.decompose()
+            if elements:
+                # Only build the tags the selectors can match, so these soups are not shared
+                html, _ = self._fetch_html(url)
+                soup = self._parse_html(html, _elements_strainer(elements))
+            else:
+                soup = self._get_content_soup(url)
             
             # Extract content based on depth
             if elements:
@@ -143,30 +258,96 @@ class WebScraperTool(BaseTool):
                 # Extract more detailed content
                 content = self._extract_structured_content(soup, max_depth)
             
-            return self._format_scraped_content(content, url)
+            formatted_content = self._format_scraped_content(content, url)
+            _scrape_cache.set(_scrape_cache_key(url, max_depth, elements), formatted_content)
+            return formatted_content
         
         except Exception as e:
             logger.error(f"Error in direct scraping: {str(e)}")
             return f"Failed to scrape {url}: {str(e)}"
     
+    def _fetch_html(self, url: str, validators: Optional[Dict[str, str]] = None) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """
+        Download a page.
+        
+        Args:
+            url: URL to fetch
+            validators: ETag/Last-Modified of a cached copy, to make the request conditional
+            
+        Returns:
+            The page body (None if the cached copy is still current) and the response validators
+        """
+        headers = dict(_REQUEST_HEADERS)
+        if validators:
+            for validator, request_header in _VALIDATOR_HEADERS:
+                if validator in validators:
+                    headers[request_header] = validators[validator]
+        
+        # Fetch the page (transient failures are retried by the session), streaming so that
+        # non-HTML bodies are never downloaded and large pages are cut off at MAX_PAGE_BYTES
+        with session.get(url, headers=headers, timeout=15, stream=True) as response:
+            if validators and response.status_code == 304:
+                return None, validators
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "text/html").lower()
+            if not content_type.startswith(HTML_CONTENT_TYPES):
+                raise ValueError(f"unsupported content type {content_type}")
+            new_validators = {validator: response.headers[validator] for validator, _ in _VALIDATOR_HEADERS
+                              if validator in response.headers}
+            return response.raw.read(MAX_PAGE_BYTES, decode_content=True), new_validators
+    
+    def _parse_html(self, html: bytes, parse_only: SoupStrainer) -> BeautifulSoup:
+        """Parse a page and remove the elements that never hold content."""
+        # Parse the raw bytes, so the parser detects the charset itself instead of decoding twice,
+        # and only build the parts of the tree the extractors read
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+        
+        # Remove unnecessary elements
+        for script in soup(_REMOVED_TAGS):
+            script.decompose()
+        return soup
+    
+    def _get_content_soup(self, url: str) -> BeautifulSoup:
+        """
+        Get the parsed content of a page, reusing a cached parse while the page is unchanged.
+        
+        The extractors only read the tree, so a cached soup is shared between requests.
+        
+        Args:
+            url: URL of the page
+            
+        Returns:
+            The page parsed with the content strainer
+        """
+        with _soup_cache_lock:
+            entry = _soup_cache.get(url)
+        if entry is not None:
+            fetched_at, validators, soup = entry
+            if time.monotonic() - fetched_at < SCRAPE_CACHE_TTL_SECONDS:
+                return soup
+            if not validators:
+                entry = None
+        
+        html, validators = self._fetch_html(url, entry[1] if entry is not None else None)
+        if html is None:
+            # Not modified: keep the cached parse
+            soup = entry[2]
+        else:
+            soup = self._parse_html(html, _CONTENT_STRAINER)
+        
+        with _soup_cache_lock:
+            _soup_cache[url] = (time.monotonic(), validators, soup)
+            _soup_cache.move_to_end(url)
+            while len(_soup_cache) > SOUP_CACHE_MAX_ENTRIES:
+                _soup_cache.popitem(last=False)
+        return soup
+    
     def _extract_elements(self, soup: BeautifulSoup, elements: List[str]) -> str:
         """Extract specific elements from the page."""
         extracted = []
         
         for selector in elements:
-            if '.' in selector:
-                # Class selector (e.g., div.content)
-                tag, class_name = selector.split('.')
-                items = soup.find_all(tag, class_=class_name)
-            elif '#' in selector:
-                # ID selector (e.g., div#main)
-                tag, id_name = selector.split('#')
-                items = [soup.find(tag, id=id_name)]
-            else:
-                # Tag selector (e.g., h1)
-                items = soup.find_all(selector)
-            
-            for item in items:
+            for item in _compile_selector(selector)(soup):
                 if item and item.text.strip():
                     text = item.text.strip()
                     extracted.append(f"{selector}: {text}")
@@ -214,24 +395,28 @@ class WebScraperTool(BaseTool):
         
         # Get headings and their content
         for h_level in range(1, min(max_depth + 1, 4)):  # h1 to h3 depending on depth
+            # A section ends at the next heading of the same or the parent level
+            boundary = frozenset((f'h{h_level}', f'h{h_level-1}'))
             headings = soup.find_all(f'h{h_level}')
             for heading in headings:
                 if heading.text.strip():
                     content.append(f"\nHeading (h{h_level}): {heading.text.strip()}")
                     
-                    # Get content under this heading
-                    next_sibling = heading.find_next_sibling()
+                    # Get content under this heading, walking its following siblings once
                     sibling_content = []
                     
-                    while next_sibling and next_sibling.name not in [f'h{h_level}', f'h{h_level-1}']:
-                        if next_sibling.name in ['p', 'ul', 'ol'] and next_sibling.text.strip():
-                            if next_sibling.name == 'ul' or next_sibling.name == 'ol':
+                    for next_sibling in heading.next_siblings:
+                        if not isinstance(next_sibling, Tag):
+                            continue  # Text between tags
+                        if next_sibling.name in boundary:
+                            break
+                        if next_sibling.name in _SECTION_CONTENT_TAGS and next_sibling.text.strip():
+                            if next_sibling.name in _LIST_TAGS:
                                 list_items = [f"• {li.text.strip()}" for li in next_sibling.find_all('li') if li.text.strip()]
                                 if list_items:
                                     sibling_content.append('\n'.join(list_items))
                             else:
                                 sibling_content.append(next_sibling.text.strip())
-                        next_sibling = next_sibling.find_next_sibling()
                     
                     if sibling_content:
                         content.append('\n'.join(sibling_content))
@@ -247,7 +432,7 @@ class WebScraperTool(BaseTool):
         """Format the scraped content for readability."""
         # Clean up the text
         content = content.replace('\t', ' ').replace('\r', '')
-        content = '\n'.join(line.strip() for line in content.split('\n') if line.strip())
+        content = '\n'.join(filter(None, map(str.strip, content.split('\n'))))
         
         # Add source information
         header = f"Content scraped from: {url}\n{'='*50}\n\n"
@@ -3,15 +3,45 @@ Web Search tool for SuperAGI.
 """
 import json
 import requests
-import subprocess
 import sys
 import time
 from typing import Dict, Any, Optional, List
+from urllib.parse import urlparse
 
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import BaseModel, Field
 
 from superagi_replit.lib.logger import logger
+from superagi_replit.llms.llm_cache import LLMCache
 from superagi_replit.tools.base_tool import BaseTool
+from superagi_replit.tools.http_session import session
+from superagi_replit.tools.web_scraper_tool import HTML_PARSER
+
+try:
+    from duckduckgo_search import DDGS
+except ImportError:
+    DDGS = None
+
+# Search results go stale quickly, so they are only reused for a minute
+SEARCH_CACHE_TTL_SECONDS = 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+_search_cache = LLMCache(max_entries=SEARCH_CACHE_MAX_ENTRIES, ttl_seconds=SEARCH_CACHE_TTL_SECONDS)
+
+# Sites searched first for venue/restaurant style queries
+SPECIALIZED_SITES = ("yelp.com", "tripadvisor.com", "opentable.com", "timeout.com")
+MAX_RESULTS_PER_SITE = 3
+
+# Browser-like headers for fetching Google results without DDGS
+_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.5'
+}
+
+# Only the result blocks of a Google results page are parsed
+_RESULT_STRAINER = SoupStrainer("div", class_="g")
+
+# Classes Google has used for result snippets
+_SNIPPET_CLASSES = ["VwiC3b", "st"]
 
 
 class WebSearchSchema(BaseModel):
@@ -32,6 +62,32 @@ class WebSearchTool(BaseTool):
         self.description = "A tool for searching the web for real-time information. Use this when you need to find current information on the internet."
         self.args_schema = WebSearchSchema
     
+    def _specialized_search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        """
+        Search all specialized sites with a single OR query.
+        
+        Results are grouped by site in SPECIALIZED_SITES order, keeping at most
+        MAX_RESULTS_PER_SITE per site so one site cannot crowd out the others.
+        Returns an empty list if the search fails.
+        """
+        results_per_site = {site: [] for site in SPECIALIZED_SITES}
+        sites_query = " OR ".join(f"site:{site}" for site in SPECIALIZED_SITES)
+        try:
+            # Its own client, so the general search that follows is not throttled by DDGS
+            with DDGS() as ddgs:
+                for result in ddgs.text(f"({sites_query}) {query}", max_results=num_results * 2):
+                    host = urlparse(result.get("href", "")).hostname or ""
+                    site = next((site for site in SPECIALIZED_SITES if host == site or host.endswith("." + site)), None)
+                    if site is not None and len(results_per_site[site]) < MAX_RESULTS_PER_SITE:
+                        results_per_site[site].append({
+                            "title": result.get("title", ""),
+                            "url": result.get("href", ""),
+                            "snippet": result.get("body", "")
+                        })
+        except Exception as site_err:
+            logger.warning(f"Site-specific search failed: {str(site_err)}")
+        return [result for site_results in results_per_site.values() for result in site_results]
+    
     def _direct_search(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
         """
         Perform a direct search using existing functions in the repo.
@@ -44,40 +100,21 @@ class WebSearchTool(BaseTool):
             
             # Use the library directly if available
             try:
-                from duckduckgo_search import DDGS
+                if DDGS is None:
+                    raise ImportError("duckduckgo_search is not installed")
                 
                 # Advanced search strategy with fallbacks and retries
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
+                        # A fresh client per attempt: DDGS delays back-to-back requests on the same
+                        # client by 0.75 s, which costs far more than reconnecting
                         with DDGS() as ddgs:
                             # Add site-specific search if query contains certain keywords
                             if any(keyword in query.lower() for keyword in ["venue", "restaurant", "location", "place"]):
-                                # Try to get higher quality results from reliable sources
-                                specialized_sites = ["yelp.com", "tripadvisor.com", "opentable.com", "timeout.com"]
-                                
-                                # Try site-specific searches first for specialized queries
-                                for site in specialized_sites:
-                                    site_results = []
-                                    site_query = f"site:{site} {query}"
-                                    logger.info(f"Specialized search attempt {attempt+1}/{max_retries} for site {site}")
-                                    
-                                    try:
-                                        site_search = list(ddgs.text(site_query, max_results=3))
-                                        for result in site_search:
-                                            site_results.append({
-                                                "title": result.get("title", ""),
-                                                "url": result.get("href", ""),
-                                                "snippet": result.get("body", "")
-                                            })
-                                    except Exception as site_err:
-                                        logger.warning(f"Site-specific search failed for {site}: {str(site_err)}")
-                                    
-                                    search_results.extend(site_results)
-                                    
-                                    # If we have enough results, stop trying more sites
-                                    if len(search_results) >= num_results:
-                                        break
+                                # Try to get higher quality results from reliable sources, all in one request
+                                logger.info(f"Specialized search attempt {attempt+1}/{max_retries} for sites {', '.join(SPECIALIZED_SITES)}")
+                                search_results.extend(self._specialized_search(query, num_results))
                             
                             # If we don't have enough results yet, do a general search
                             if len(search_results) < num_results:
@@ -107,8 +144,9 @@ class WebSearchTool(BaseTool):
                             
                     except Exception as e:
                         logger.warning(f"Search attempt {attempt+1} failed: {str(e)}")
-                        # Brief exponential backoff before retrying
-                        time.sleep(1 * (attempt + 1))
+                        # Brief exponential backoff before retrying (not after the last attempt)
+                        if attempt < max_retries - 1:
+                            time.sleep(1 * (attempt + 1))
                 
                 # If all retries failed but we have partial results, return those
                 if search_results:
@@ -118,50 +156,33 @@ class WebSearchTool(BaseTool):
                 # If all retries completely failed, raise to try alternate method
                 raise Exception("All DDGS search attempts failed")
             except ImportError:
-                # If duckduckgo_search isn't available, use subprocess to run a simple curl to Google
-                logger.info("DDGS import failed, trying subprocess method")
-                
-                # Sanitize the query
-                safe_query = query.replace('"', '\\"')
-                cmd = f'curl -s "https://www.google.com/search?q={safe_query.replace(" ", "+")}&num={num_results}"'
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-                
-                # Extract basic results (this is a very simplified extractor)
-                html = result.stdout
-                
-                # Very basic extraction - in a real implementation, this would use BeautifulSoup
-                titles = []
-                urls = []
-                snippets = []
+                # If duckduckgo_search isn't available, fetch a Google results page directly
+                logger.info("DDGS import failed, trying direct Google search")
                 
-                # Find search result sections
-                for line in html.split('\n'):
-                    if '<h3' in line:
-                        if '</h3>' in line:
-                            title_start = line.find('>', line.find('<h3'))
-                            title_end = line.find('</h3>', title_start)
-                            if title_start > 0 and title_end > 0:
-                                titles.append(line[title_start+1:title_end].strip())
-                    
-                    if 'class="iUh30' in line and 'http' in line:
-                        url_start = line.find('http')
-                        url_end = line.find('</div>', url_start)
-                        if url_start > 0 and url_end > 0:
-                            urls.append(line[url_start:url_end].strip())
-                            
-                    if 'class="st"' in line:
-                        snippet_start = line.find('>', line.find('class="st"'))
-                        snippet_end = line.find('</span>', snippet_start)
-                        if snippet_start > 0 and snippet_end > 0:
-                            snippets.append(line[snippet_start+1:snippet_end].strip())
+                response = session.get(
+                    "https://www.google.com/search",
+                    params={"q": query, "num": num_results},
+                    headers=_BROWSER_HEADERS,
+                    timeout=10
+                )
                 
-                # Combine into results
-                for i in range(min(len(titles), len(urls), len(snippets))):
+                # Each organic result is a div.g holding the title (h3), link and snippet
+                soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=_RESULT_STRAINER)
+                seen_urls = set()
+                for block in soup.find_all("div", class_="g"):
+                    title = block.find("h3")
+                    link = block.find("a", href=True)
+                    if not title or not link or not link["href"].startswith("http") or link["href"] in seen_urls:
+                        continue
+                    snippet = block.find(class_=_SNIPPET_CLASSES)
+                    seen_urls.add(link["href"])
                     search_results.append({
-                        "title": titles[i],
-                        "url": urls[i],
-                        "snippet": snippets[i]
+                        "title": title.get_text(strip=True),
+                        "url": link["href"],
+                        "snippet": snippet.get_text(" ", strip=True) if snippet else ""
                     })
+                    if len(search_results) >= num_results:
+                        break
                 
                 if not search_results:
                     # Fallback to placeholder results with the query
@@ -169,11 +190,12 @@ class WebSearchTool(BaseTool):
                         {
                             "title": f"Search results for {query}",
                             "url": f"https://www.google.com/search?q={query.replace(' ', '+')}",
-                            "snippet": "Direct search results were not able to be retrieved. Please try accessing the search URL directly."
+                            "snippet": "Direct search results were not able to be retrieved. Please try accessing the search URL directly.",
+                            "placeholder": True
                         }
                     ]
                     
-                logger.info(f"Got {len(search_results)} results via subprocess")
+                logger.info(f"Got {len(search_results)} results via direct Google search")
                 return search_results
         except Exception as e:
             logger.error(f"Error in direct search: {str(e)}")
@@ -181,7 +203,8 @@ class WebSearchTool(BaseTool):
                 {
                     "title": f"Search query for: {query}",
                     "url": f"https://www.google.com/search?q={query.replace(' ', '+')}",
-                    "snippet": f"Unable to retrieve search results directly. Error: {str(e)}"
+                    "snippet": f"Unable to retrieve search results directly. Error: {str(e)}",
+                    "placeholder": True
                 }
             ]
     
@@ -202,6 +225,12 @@ class WebSearchTool(BaseTool):
             # Ensure num_results is within bounds
             num_results = min(max(1, num_results), 10)
             
+            cache_key = json.dumps([query, num_results])
+            cached_results = _search_cache.get(cache_key)
+            if cached_results is not None:
+                logger.info(f"Returning cached search results for: {query}")
+                return cached_results
+            
             # First try using the proxy
             search_url = "http://localhost:5000/search"
             
@@ -213,7 +242,7 @@ class WebSearchTool(BaseTool):
             logger.info(f"Attempting web search for: {query}")
             
             try:
-                response = requests.post(
+                response = session.post(
                     search_url,
                     json=payload,
                     headers={"Content-Type": "application/json"},
@@ -229,12 +258,12 @@ class WebSearchTool(BaseTool):
                 else:
                     logger.warning("No results from proxy, falling back to direct search")
                     search_results = self._direct_search(query, num_results)
-            except (requests.RequestException, json.JSONDecodeError) as e:
+            except requests.RequestException as e:
                 logger.warning(f"Error with search proxy: {str(e)}, falling back to direct search")
                 search_results = self._direct_search(query, num_results)
             
             # Format the results
-            formatted_results = f"Search results for: '{query}'\n\n"
+            parts = [f"Search results for: '{query}'\n\n"]
             
             if search_results:
                 for i, result in enumerate(search_results, 1):
@@ -242,11 +271,14 @@ class WebSearchTool(BaseTool):
                     url = result.get("url", "No URL")
                     snippet = result.get("snippet", "No description")
                     
-                    formatted_results += f"{i}. {title}\n"
-                    formatted_results += f"   URL: {url}\n"
-                    formatted_results += f"   Description: {snippet}\n\n"
+                    parts.append(f"{i}. {title}\n   URL: {url}\n   Description: {snippet}\n\n")
             else:
-                formatted_results += "No results found."
+                parts.append("No results found.")
+            formatted_results = "".join(parts)
+            
+            # Placeholders stand in for a failed search, which should be retried next time
+            if search_results and not any(result.get("placeholder") for result in search_results):
+                _search_cache.set(cache_key, formatted_results)
                 
             return formatted_results
             
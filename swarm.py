@@ -7,11 +7,15 @@ from config import PROXY_URL, WORKER_COUNT, LOG_DIR
 
 logger = setup_logger("swarm", log_dir=LOG_DIR)
 
+# Seconds a worker waits on an empty queue before shutting down
+POP_TIMEOUT = 0.2
+
 def worker(queue, proxy_url, test_cmd, max_attempts):
     while True:
-        path = queue.pop()
+        # Every file is queued before the workers start, so an empty queue means the work is done
+        path = queue.pop(timeout=POP_TIMEOUT)
         if path is None:
-            logger.info(f"{threading.current_thread().name} received shutdown signal.")
+            logger.info(f"{threading.current_thread().name} found no more files, shutting down.")
             break
         logger.info(f"[{threading.current_thread().name}] Processing {path}")
         try:
@@ -33,19 +37,16 @@ def main():
 
     if args.action == "fix":
         queue = TaskQueue()
-        for f in args.files:
-            queue.push(f)
-        # Sentinel None for each worker to exit
+        queue.push_many(args.files)
         num_workers = args.workers or WORKER_COUNT
-        for _ in range(num_workers):
-            queue.push(None)
 
         threads = []
         for i in range(num_workers):
             t = threading.Thread(
                 target=worker,
                 args=(queue, args.proxy, args.test_cmd, args.attempts or 3),
-                name=f"Worker-{i+1}"
+                name=f"Worker-{i+1}",
+                daemon=True
             )
             t.start()
             threads.append(t)
@@ -14,22 +14,28 @@ import os
 import sys
 import time
 import argparse
+import asyncio
+import base64
 import threading
 import queue
 import logging
+import itertools
 import json
 import requests
-import importlib
+from requests.adapters import HTTPAdapter
+import importlib.metadata
 import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 
 # Import our modules
 from task_queue import TaskQueue
 from loop_controller import fix_file_loop
-from gemini_client import call_gemini, web_search, fetch_url, scrape_text
-from file_agent import read_file, write_file
-from runner import run_command
+from gemini_client import call_gemini, web_search, fetch_url, scrape_text, dump_json, load_json, JSON_HEADERS
+from file_agent import read_file, read_file_bytes, write_file
+from runner import run_command, run_command_streaming
 from logger import setup_logger
 from config import (
     PROXY_URL, LOG_DIR, WORKER_COUNT, MAX_ATTEMPTS,
@@ -56,6 +62,60 @@ class TaskType(Enum):
     EXECUTE = "execute"        # Execute a command
     INSTALL_PACKAGE = "install_package"  # Install a Python package
 
+# Define worker pools, so that slow tasks cannot hold up short ones
+class WorkerPool(Enum):
+    NETWORK = "network"    # Prompts and web requests
+    BLOCKING = "blocking"  # Code fixes, commands and package installs (can run for minutes)
+    FILE_IO = "file_io"    # File reads and writes
+
+# Pool serving each task type
+TASK_POOLS = {
+    TaskType.PROMPT: WorkerPool.NETWORK,
+    TaskType.WEB_SEARCH: WorkerPool.NETWORK,
+    TaskType.WEB_FETCH: WorkerPool.NETWORK,
+    TaskType.SCRAPE: WorkerPool.NETWORK,
+    TaskType.CODE_FIX: WorkerPool.BLOCKING,
+    TaskType.EXECUTE: WorkerPool.BLOCKING,
+    TaskType.INSTALL_PACKAGE: WorkerPool.BLOCKING,
+    TaskType.READ_FILE: WorkerPool.FILE_IO,
+    TaskType.WRITE_FILE: WorkerPool.FILE_IO,
+}
+
+# Worker threads of the blocking and file I/O pools (the network pool has worker_count)
+BLOCKING_POOL_SIZE = 2
+FILE_IO_POOL_SIZE = 4
+
+# Tasks a pool's queue holds before add_task applies back-pressure
+MIN_QUEUE_SIZE = 1024
+QUEUED_TASKS_PER_WORKER = 16
+
+# Queue rank of each priority (lower is served first); stop signals go ahead of all tasks
+PRIORITY_RANK = {TaskPriority.HIGH: 0, TaskPriority.LOW: 1}
+STOP_RANK = -1
+
+# Source of task IDs; unique within the process even for tasks created in the same millisecond
+_task_seq = itertools.count()
+
+# (connect, read) timeout in seconds for calls to the extended proxy
+PROXY_TIMEOUT = (3.05, 60)
+
+# Bytes kept from the end of a command's stdout and stderr, unless the task asks for full_output
+OUTPUT_TAIL_BYTES = 4096
+
+# Responses to prompt tasks marked cacheable are reused for identical prompts for this long
+PROMPT_CACHE_TTL = 60
+PROMPT_CACHE_SIZE = 512
+
+# Seconds allowed for importing a freshly installed package in the verification subprocess
+IMPORT_PROBE_TIMEOUT = 10
+
+# Completed tasks are forgotten after this many seconds, or sooner once more than
+# MAX_TRACKED_TASKS tasks are tracked; the statuses of the most recently forgotten
+# tasks stay available to get_task_status
+COMPLETED_TASK_TTL = 300
+MAX_TRACKED_TASKS = 10_000
+EVICTED_STATUS_CACHE_SIZE = 1024
+
 class Task:
     """Represents a task to be processed by an agent in the swarm."""
     
@@ -70,29 +130,71 @@ class Task:
         self.data = data
         self.priority = priority
         self.callback = callback
-        self.id = f"{task_type.value}_{int(time.time() * 1000)}"
+        # Enum values used in every log line and status dict, looked up once
+        self._type_str = task_type.value
+        self._priority_str = priority.value
+        self.id = f"{self._type_str}_{next(_task_seq):08x}"
         self.result = None
         self.error = None
         self.completed = False
+        self.completed_at = None
+        # Set once the task is completed, so waiters block instead of polling
+        self._done = threading.Event()
+        # Called with the task once it is completed; set by the controller tracking it
+        self._on_completed: Optional[Callable[["Task"], None]] = None
     
     def mark_completed(self, result=None, error=None):
         """Mark this task as completed with an optional result or error."""
         self.result = result
         self.error = error
+        # completed_at first, since other threads read it as soon as completed is set
+        self.completed_at = time.monotonic()
         self.completed = True
+        if self._on_completed is not None:
+            self._on_completed(self)
         
-        if self.callback and callable(self.callback):
-            response = {
-                "task_id": self.id,
-                "task_type": self.task_type.value,
-                "completed": self.completed,
-                "result": self.result,
-                "error": self.error
-            }
-            self.callback(response)
+        try:
+            if self.callback and callable(self.callback):
+                response = {
+                    "task_id": self.id,
+                    "task_type": self._type_str,
+                    "completed": self.completed,
+                    "result": self.result,
+                    "error": self.error
+                }
+                self.callback(response)
+        finally:
+            # Wake waiters even if the callback raised
+            self._done.set()
     
     def __str__(self):
-        return f"Task(id={self.id}, type={self.task_type.value}, priority={self.priority.value})"
+        return f"Task(id={self.id}, type={self._type_str}, priority={self._priority_str})"
+
+def _top_level_module(package_name: str) -> str:
+    """
+    Find the module an installed distribution provides (e.g. "bs4" for "beautifulsoup4").
+    
+    Reads the distribution metadata only, so nothing is imported. Falls back to the
+    package name with dashes turned into underscores.
+    """
+    default = package_name.replace("-", "_")
+    try:
+        dist = importlib.metadata.distribution(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        return default
+    
+    top_level = dist.read_text("top_level.txt")
+    if top_level:
+        candidates = top_level.split()
+    else:
+        # No top_level.txt: use the packages and modules installed at the top of site-packages
+        candidates = [f.parts[0] for f in dist.files or [] if len(f.parts) == 2 and f.name == "__init__.py"]
+        candidates += [f.stem for f in dist.files or [] if len(f.parts) == 1 and f.suffix == ".py"]
+    
+    public = [name for name in candidates if not name.startswith("_")]
+    if default.lower() in public:
+        return default.lower()
+    return public[0] if public else default
 
 class SwarmController:
     """
@@ -112,14 +214,57 @@ class SwarmController:
         self.worker_count = worker_count
         self.max_attempts = max_attempts
         
-        # Task queues
-        self.high_priority_queue = queue.Queue()
-        self.low_priority_queue = queue.Queue()
+        # Worker threads per pool
+        self.pool_sizes = {
+            WorkerPool.NETWORK: worker_count,
+            WorkerPool.BLOCKING: BLOCKING_POOL_SIZE,
+            WorkerPool.FILE_IO: FILE_IO_POOL_SIZE,
+        }
+        
+        # Task queue of each pool, holding (priority rank, sequence number, task); the
+        # sequence number keeps tasks of the same priority in FIFO order
+        self.task_queues = {
+            pool: queue.PriorityQueue(maxsize=max(MIN_QUEUE_SIZE, QUEUED_TASKS_PER_WORKER * size))
+            for pool, size in self.pool_sizes.items()
+        }
+        self._task_seq = itertools.count()
         
         # Track tasks
-        self.tasks = {}  # task_id -> Task object
+        self.tasks: "OrderedDict[str, Task]" = OrderedDict()  # task_id -> Task object, oldest first
+        self._evicted_statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Tracked tasks in the order they completed, so eviction never scans incomplete ones
+        self._completed_tasks: "deque[Task]" = deque()
         self.task_lock = threading.Lock()
         
+        # (proxy URL, prompt, priority, verbose) -> (expiry time, result) for cacheable prompts
+        self._prompt_cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._prompt_cache_lock = threading.Lock()
+        
+        # HTTP session shared by the workers, so proxy connections are kept alive between tasks
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=worker_count, pool_maxsize=worker_count * 2, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # pip installs run one at a time (pip locks site-packages anyway) on their own thread,
+        # so a slow install does not hold a worker that could serve other tasks. Created on
+        # first use and dropped by stop(), since a shut down executor cannot be restarted.
+        self._pip_executor: Optional[ThreadPoolExecutor] = None
+        self._pip_executor_lock = threading.Lock()
+        
+        # Handler for each task type
+        self._handlers: Dict[TaskType, Callable[[Task], None]] = {
+            TaskType.PROMPT: self._handle_prompt_task,
+            TaskType.CODE_FIX: self._handle_code_fix_task,
+            TaskType.WEB_SEARCH: self._handle_web_search_task,
+            TaskType.WEB_FETCH: self._handle_web_fetch_task,
+            TaskType.SCRAPE: self._handle_scrape_task,
+            TaskType.READ_FILE: self._handle_read_file_task,
+            TaskType.WRITE_FILE: self._handle_write_file_task,
+            TaskType.EXECUTE: self._handle_execute_task,
+            TaskType.INSTALL_PACKAGE: self._handle_install_package_task,
+        }
+        
         # Worker threads
         self.workers = []
         self.running = False
@@ -133,17 +278,19 @@ class SwarmController:
         self.running = True
         
         # Create and start worker threads
-        for i in range(self.worker_count):
-            t = threading.Thread(
-                target=self._worker_loop,
-                name=f"SwarmWorker-{i+1}",
-                daemon=True
-            )
-            self.workers.append(t)
-            t.start()
-            logger.info(f"Started worker thread: {t.name}")
+        for pool, size in self.pool_sizes.items():
+            for i in range(size):
+                t = threading.Thread(
+                    target=self._worker_loop,
+                    args=(pool,),
+                    name=f"SwarmWorker-{pool.value}-{i+1}",
+                    daemon=True
+                )
+                self.workers.append(t)
+                t.start()
+                logger.info(f"Started worker thread: {t.name}")
         
-        logger.info(f"Swarm controller started with {self.worker_count} workers")
+        logger.info(f"Swarm controller started with {len(self.workers)} workers")
     
     def stop(self):
         """Stop all worker threads."""
@@ -153,10 +300,14 @@ class SwarmController:
         
         self.running = False
         
-        # Add termination signals to the queues
-        for _ in range(self.worker_count):
-            self.high_priority_queue.put(None)
-            self.low_priority_queue.put(None)
+        # Add termination signals to the queues. A full queue has no idle worker waiting
+        # for a signal; busy workers exit once their task is done.
+        for pool, size in self.pool_sizes.items():
+            for _ in range(size):
+                try:
+                    self.task_queues[pool].put_nowait((STOP_RANK, next(self._task_seq), None))
+                except queue.Full:
+                    break
         
         # Wait for workers to finish
         for t in self.workers:
@@ -164,30 +315,66 @@ class SwarmController:
                 t.join(timeout=2.0)
         
         self.workers = []
+        with self._pip_executor_lock:
+            pip_executor, self._pip_executor = self._pip_executor, None
+        if pip_executor is not None:
+            pip_executor.shutdown(wait=False)
+        self._session.close()
         logger.info("Swarm controller stopped")
     
-    def add_task(self, task: Task) -> str:
+    def add_task(self, task: Task, block: bool = True, timeout: Optional[float] = None) -> str:
         """
         Add a task to the appropriate queue based on its priority.
+        
+        When the queue is full, waits for room (up to timeout if given) when block
+        is True. If there is still no room, the task is completed with a
+        "Task queue full" error instead of being queued.
+        
         Returns the task ID.
         """
-        with self.task_lock:
-            self.tasks[task.id] = task
-        
-        if task.priority == TaskPriority.HIGH:
-            self.high_priority_queue.put(task)
-            logger.info(f"Added high priority task: {task}")
-        else:
-            self.low_priority_queue.put(task)
-            logger.info(f"Added low priority task: {task}")
+        self._register_tasks([task])
+        if self._enqueue(task, block, timeout):
+            logger.info(f"Added {task._priority_str} priority task: {task}")
         
         return task.id
+    
+    def add_tasks(self, tasks: List[Task], block: bool = True, timeout: Optional[float] = None) -> List[str]:
+        """
+        Add several tasks at once, registering them all under a single lock.
+        
+        Queue-full handling is the same as for add_task, with timeout applying to each task.
+        
+        Returns the task IDs, in the same order as tasks.
+        """
+        self._register_tasks(tasks)
+        queued = sum(self._enqueue(task, block, timeout) for task in tasks)
+        logger.info(f"Added {queued} of {len(tasks)} tasks")
+        
+        return [task.id for task in tasks]
+    
+    def _enqueue(self, task: Task, block: bool, timeout: Optional[float]) -> bool:
+        """Put a registered task on its pool's queue. Returns False if it was rejected because the queue is full."""
+        # Unknown task types go to the network pool, where they fail in _process_task
+        pool = TASK_POOLS.get(task.task_type, WorkerPool.NETWORK)
+        try:
+            self.task_queues[pool].put((PRIORITY_RANK[task.priority], next(self._task_seq), task),
+                                       block=block, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"Rejected task, {pool.value} queue is full: {task}")
+            task.mark_completed(error="Task queue full")
+            return False
+        return True
+        
+    def add_prompt_task(self, prompt: str, priority: TaskPriority = TaskPriority.LOW, cacheable: bool = False) -> str:
+        """
+        Add a simple prompt task and return its ID.
         
-    def add_prompt_task(self, prompt: str, priority: TaskPriority = TaskPriority.LOW) -> str:
-        """Add a simple prompt task and return its ID."""
+        With cacheable, a response to the same prompt from the last PROMPT_CACHE_TTL
+        seconds is reused; leave it off for prompts that need a fresh generation.
+        """
         task = Task(
             task_type=TaskType.PROMPT,
-            data={"prompt": prompt},
+            data={"prompt": prompt, "cacheable": cacheable},
             priority=priority
         )
         return self.add_task(task)
@@ -210,97 +397,124 @@ class SwarmController:
         )
         return self.add_task(task)
     
-    def get_task_status(self, task_id: str) -> Dict[str, Any]:
-        """Get the status of a task by its ID."""
+    async def run_task(self, task: Task) -> Dict[str, Any]:
+        """
+        Run a task from async code without going through the worker queue.
+        
+        The blocking handler runs in a thread of the event loop's executor, so many
+        I/O-bound tasks (prompts, searches, fetches) can be in flight at once instead
+        of at most worker_count.
+        
+        Returns the task status once completed.
+        """
+        self._register_tasks([task])
+        
+        await asyncio.to_thread(self._process_task, task)
+        # Package installs complete later, on the pip thread
+        if not task._done.is_set():
+            await asyncio.to_thread(task._done.wait)
+        return self.get_task_status(task.id)
+    
+    def _register_tasks(self, tasks: List[Task]):
+        """Track new tasks, forgetting old completed tasks to keep memory bounded."""
         with self.task_lock:
-            task = self.tasks.get(task_id)
-            if not task:
-                return {"error": f"Task {task_id} not found"}
+            for task in tasks:
+                self.tasks[task.id] = task
+                # deque.append is thread-safe, so workers record completions without the lock
+                task._on_completed = self._completed_tasks.append
+                if task.completed:
+                    self._completed_tasks.append(task)
+            
+            # Tasks are appended as they complete, so expired ones are at the front
+            expired_before = time.monotonic() - COMPLETED_TASK_TTL
+            while self._completed_tasks and self._completed_tasks[0].completed_at <= expired_before:
+                self._evict_task(self._completed_tasks.popleft())
             
-            return {
-                "task_id": task.id,
-                "task_type": task.task_type.value,
-                "priority": task.priority.value,
-                "completed": task.completed,
-                "result": task.result,
-                "error": task.error
-            }
+            # Over the limit: forget the earliest completed tasks, going down to 90% of the
+            # limit so that eviction does not repeat on every new task
+            if len(self.tasks) > MAX_TRACKED_TASKS:
+                while self._completed_tasks and len(self.tasks) > MAX_TRACKED_TASKS * 9 // 10:
+                    self._evict_task(self._completed_tasks.popleft())
+    
+    def _evict_task(self, task: Task):
+        """Stop tracking a completed task, keeping its status in the evicted status cache. Requires task_lock."""
+        # A task completed twice (e.g. its callback raised) is queued twice; only evict it once
+        if self.tasks.get(task.id) is not task:
+            return
+        # Cache the status before dropping the task, so lock-free readers always find one of them
+        self._evicted_statuses[task.id] = self._task_status(task)
+        del self.tasks[task.id]
+        while len(self._evicted_statuses) > EVICTED_STATUS_CACHE_SIZE:
+            self._evicted_statuses.popitem(last=False)
+    
+    @staticmethod
+    def _task_status(task: Task) -> Dict[str, Any]:
+        """Build the status dict of a task."""
+        return {
+            "task_id": task.id,
+            "task_type": task._type_str,
+            "priority": task._priority_str,
+            "completed": task.completed,
+            "result": task.result,
+            "error": task.error
+        }
+    
+    def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Get the status of a task by its ID."""
+        # No lock needed: single dict lookups are atomic, and mark_completed sets the
+        # result and error before the completed flag
+        task = self.tasks.get(task_id)
+        if not task:
+            return self._evicted_statuses.get(task_id) or {"error": f"Task {task_id} not found"}
+        
+        return self._task_status(task)
     
     def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """Wait for a task to complete and return its result."""
-        start_time = time.time()
-        while timeout is None or (time.time() - start_time) < timeout:
-            status = self.get_task_status(task_id)
-            if status.get("completed", False) or "error" in status:
-                return status
-            time.sleep(0.1)
+        task = self.tasks.get(task_id)
+        if not task:
+            return self._evicted_statuses.get(task_id) or {"error": f"Task {task_id} not found"}
         
-        return {"error": f"Task {task_id} timed out"}
+        if not task._done.wait(timeout):
+            return {"error": f"Task {task_id} timed out"}
+        return self._task_status(task)
     
-    def _worker_loop(self):
-        """Main worker loop that processes tasks from the queues."""
+    def _worker_loop(self, pool: WorkerPool):
+        """Main worker loop that processes tasks from a pool's queue, high priority first."""
         thread_name = threading.current_thread().name
         logger.info(f"{thread_name} starting")
+        task_queue = self.task_queues[pool]
         
         while self.running:
-            # Check high priority queue first (with timeout)
-            try:
-                task = self.high_priority_queue.get(block=True, timeout=0.1)
-                if task is None:  # Termination signal
-                    logger.info(f"{thread_name} received termination signal")
-                    break
-                logger.info(f"{thread_name} processing high priority task: {task}")
-                self._process_task(task, priority=TaskPriority.HIGH)
-                self.high_priority_queue.task_done()
-                continue
-            except queue.Empty:
-                pass  # No high priority tasks, check low priority
-            
-            # Check low priority queue
-            try:
-                task = self.low_priority_queue.get(block=True, timeout=0.5)
-                if task is None:  # Termination signal
-                    logger.info(f"{thread_name} received termination signal")
-                    break
-                logger.info(f"{thread_name} processing low priority task: {task}")
-                self._process_task(task, priority=TaskPriority.LOW)
-                self.low_priority_queue.task_done()
-            except queue.Empty:
-                continue  # No tasks available, loop again
+            # Block until a task or a termination signal arrives
+            _, _, task = task_queue.get()
+            if task is None:  # Termination signal
+                logger.info(f"{thread_name} received termination signal")
+                break
+            logger.info(f"{thread_name} processing {task._priority_str} priority task: {task}")
+            self._process_task(task)
+            task_queue.task_done()
         
         logger.info(f"{thread_name} exiting")
     
-    def _process_task(self, task: Task, priority: TaskPriority):
-        """Process a task based on its type and priority."""
+    def _process_task(self, task: Task):
+        """Process a task with the handler for its type."""
         try:
-            if task.task_type == TaskType.PROMPT:
-                self._handle_prompt_task(task, priority)
-            elif task.task_type == TaskType.CODE_FIX:
-                self._handle_code_fix_task(task)
-            elif task.task_type == TaskType.WEB_SEARCH:
-                self._handle_web_search_task(task)
-            elif task.task_type == TaskType.WEB_FETCH:
-                self._handle_web_fetch_task(task)
-            elif task.task_type == TaskType.SCRAPE:
-                self._handle_scrape_task(task)
-            elif task.task_type == TaskType.READ_FILE:
-                self._handle_read_file_task(task)
-            elif task.task_type == TaskType.WRITE_FILE:
-                self._handle_write_file_task(task)
-            elif task.task_type == TaskType.EXECUTE:
-                self._handle_execute_task(task)
-            elif task.task_type == TaskType.INSTALL_PACKAGE:
-                self._handle_install_package_task(task)
-            else:
+            handler = self._handlers.get(task.task_type)
+            if handler is None:
                 raise ValueError(f"Unknown task type: {task.task_type}")
+            handler(task)
         except Exception as e:
             logger.exception(f"Error processing task {task.id}: {e}")
             task.mark_completed(error=str(e))
     
-    def _handle_prompt_task(self, task: Task, priority: TaskPriority):
+    def _handle_prompt_task(self, task: Task):
         """Handle a simple prompt to Gemini."""
         prompt = task.data.get("prompt", "")
+        priority = task.priority
         verbose = task.data.get("verbose", True)  # Default to verbose mode
+        # Skip building the verbose messages when INFO records would be dropped anyway
+        log_verbose = verbose and logger.isEnabledFor(logging.INFO)
         
         if not prompt:
             logger.error("Empty prompt provided to _handle_prompt_task")
@@ -308,44 +522,56 @@ class SwarmController:
             return
         
         # Log the thinking process
-        if verbose:
-            logger.info(f"🧠 THINKING: Analyzing prompt complexity and selecting appropriate model...")
-            logger.info(f"🧠 PROMPT: '{prompt[:100]}...' (truncated)")
-            logger.info(f"🧠 PRIORITY: {priority.value}")
+        if log_verbose:
+            logger.info("🧠 THINKING: Analyzing prompt complexity and selecting appropriate model...")
+            logger.info("🧠 PROMPT: '%.100s...' (truncated)", prompt)
+            logger.info("🧠 PRIORITY: %s", task._priority_str)
         
         # Choose proxy based on priority
         proxy_url = self.extended_proxy_url if priority == TaskPriority.HIGH else self.main_proxy_url
         
-        if verbose:
+        if log_verbose:
             model_type = "LARGE (complex reasoning)" if priority == TaskPriority.HIGH else "SMALL (faster response)"
-            logger.info(f"🧠 MODEL SELECTION: Using {model_type} model for this task")
-            logger.info(f"🧠 ENDPOINT: Routing to {proxy_url}")
+            logger.info("🧠 MODEL SELECTION: Using %s model for this task", model_type)
+            logger.info("🧠 ENDPOINT: Routing to %s", proxy_url)
+        
+        # Identical cacheable prompts are answered from the prompt cache
+        cache_key = (proxy_url, prompt, task._priority_str, verbose) if task.data.get("cacheable", False) else None
+        if cache_key is not None:
+            cached = self._get_cached_prompt_result(cache_key)
+            if cached is not None:
+                if log_verbose:
+                    logger.info("🧠 CACHE HIT: Reusing the response to an identical prompt")
+                task.mark_completed(result=cached)
+                return
         
         # Add priority parameter for the extended proxy
         if proxy_url == self.extended_proxy_url:
             # Call extended proxy with priority parameter
             try:
-                if verbose:
-                    logger.info(f"🧠 ACTION: Sending prompt to extended proxy with priority={priority.value}")
+                if log_verbose:
+                    logger.info("🧠 ACTION: Sending prompt to extended proxy with priority=%s", task._priority_str)
                 
-                response = requests.post(
+                response = self._session.post(
                     proxy_url,
-                    json={"prompt": prompt, "priority": priority.value, "verbose": verbose}
+                    data=dump_json({"prompt": prompt, "priority": task._priority_str, "verbose": verbose}),
+                    headers=JSON_HEADERS,
+                    timeout=PROXY_TIMEOUT
                 )
                 response.raise_for_status()
-                result = response.json()
+                result = load_json(response.content)
                 
-                if verbose:
-                    logger.info(f"🧠 RESPONSE: Successfully received response from extended proxy")
-                    model_used = result.get("model_used", "unknown")
-                    logger.info(f"🧠 MODEL USED: {model_used}")
+                if log_verbose:
+                    logger.info("🧠 RESPONSE: Successfully received response from extended proxy")
+                    logger.info("🧠 MODEL USED: %s", result.get("model_used", "unknown"))
                     
                     # Show a snippet of the response
                     response_text = result.get("response", "")
                     if response_text:
-                        preview = response_text[:100] + "..." if len(response_text) > 100 else response_text
-                        logger.info(f"🧠 RESPONSE PREVIEW: {preview}")
+                        logger.info("🧠 RESPONSE PREVIEW: %.100s%s", response_text, "..." if len(response_text) > 100 else "")
                 
+                if cache_key is not None:
+                    self._cache_prompt_result(cache_key, result)
                 task.mark_completed(result=result)
             except Exception as e:
                 logger.error(f"ERROR in extended proxy call: {str(e)}", exc_info=True)
@@ -353,22 +579,44 @@ class SwarmController:
         else:
             # Call main proxy
             try:
-                if verbose:
-                    logger.info(f"🧠 ACTION: Sending prompt to main proxy")
+                if log_verbose:
+                    logger.info("🧠 ACTION: Sending prompt to main proxy")
                 
                 result = call_gemini(proxy_url, prompt)
                 
-                if verbose:
-                    logger.info(f"🧠 RESPONSE: Successfully received response from main proxy")
+                if log_verbose:
+                    logger.info("🧠 RESPONSE: Successfully received response from main proxy")
                     # Show a snippet of the response
-                    preview = result[:100] + "..." if len(result) > 100 else result
-                    logger.info(f"🧠 RESPONSE PREVIEW: {preview}")
+                    logger.info("🧠 RESPONSE PREVIEW: %.100s%s", result, "..." if len(result) > 100 else "")
                 
+                # call_gemini returns an empty response on failure, which is not worth caching
+                if cache_key is not None and result:
+                    self._cache_prompt_result(cache_key, {"response": result})
                 task.mark_completed(result={"response": result})
             except Exception as e:
                 logger.error(f"ERROR in main proxy call: {str(e)}", exc_info=True)
                 task.mark_completed(error=f"Error calling Gemini: {str(e)}")
     
+    def _get_cached_prompt_result(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Get a copy of the cached result for a prompt, or None on a miss or expired entry."""
+        with self._prompt_cache_lock:
+            entry = self._prompt_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._prompt_cache[key]
+                return None
+            self._prompt_cache.move_to_end(key)
+            return dict(entry[1])
+    
+    def _cache_prompt_result(self, key: tuple, result: Dict[str, Any]):
+        """Cache the result of a prompt, evicting the least recently used entry when full."""
+        with self._prompt_cache_lock:
+            self._prompt_cache[key] = (time.monotonic() + PROMPT_CACHE_TTL, dict(result))
+            self._prompt_cache.move_to_end(key)
+            while len(self._prompt_cache) > PROMPT_CACHE_SIZE:
+                self._prompt_cache.popitem(last=False)
+    
     def _handle_code_fix_task(self, task: Task):
         """Handle a code fix task using the loop controller."""
         path = task.data.get("path", "")
@@ -438,8 +686,13 @@ class SwarmController:
             return
         
         try:
-            content = read_file(path)
-            task.mark_completed(result={"content": content})
+            if task.data.get("binary", False):
+                # Raw bytes, base64 encoded for the result; skips decoding the file as text
+                content = read_file_bytes(path)
+                task.mark_completed(result={"content_b64": base64.b64encode(content).decode("ascii"), "bytes": len(content)})
+            else:
+                content = read_file(path)
+                task.mark_completed(result={"content": content})
         except Exception as e:
             task.mark_completed(error=f"Error reading file: {str(e)}")
     
@@ -453,6 +706,9 @@ class SwarmController:
             return
         
         try:
+            if task.data.get("binary", False):
+                # Base64 encoded raw bytes, written without encoding them as text
+                content = base64.b64decode(task.data.get("content_b64", ""))
             write_file(path, content)
             task.mark_completed(result={"success": True})
         except Exception as e:
@@ -461,29 +717,37 @@ class SwarmController:
     def _handle_execute_task(self, task: Task):
         """Handle an execute command task."""
         cmd = task.data.get("cmd", "")
-        verbose = task.data.get("verbose", True)
+        log_verbose = task.data.get("verbose", True) and logger.isEnabledFor(logging.INFO)
         
         if not cmd:
             task.mark_completed(error="Missing command")
             return
         
-        if verbose:
-            logger.info(f"🧠 EXECUTING: Running shell command: {cmd}")
+        if log_verbose:
+            logger.info("🧠 EXECUTING: Running shell command: %s", cmd)
             
         try:
-            returncode, stdout, stderr = run_command(cmd)
+            if task.data.get("full_output", False):
+                returncode, stdout, stderr = run_command(cmd)
+                stdout_bytes, stderr_bytes = len(stdout.encode()), len(stderr.encode())
+            else:
+                # Keep only the end of the output, so a chatty command cannot exhaust memory
+                returncode, stdout, stderr, stdout_bytes, stderr_bytes = run_command_streaming(
+                    cmd, task.data.get("tail_bytes", OUTPUT_TAIL_BYTES))
             
-            if verbose:
-                logger.info(f"🧠 EXECUTION COMPLETE: Command returned code {returncode}")
+            if log_verbose:
+                logger.info("🧠 EXECUTION COMPLETE: Command returned code %s", returncode)
                 if stdout:
-                    logger.info(f"🧠 STDOUT: {stdout[:200]}..." if len(stdout) > 200 else f"🧠 STDOUT: {stdout}")
+                    logger.info("🧠 STDOUT: %.200s%s", stdout, "..." if len(stdout) > 200 else "")
                 if stderr:
-                    logger.info(f"🧠 STDERR: {stderr[:200]}..." if len(stderr) > 200 else f"🧠 STDERR: {stderr}")
+                    logger.info("🧠 STDERR: %.200s%s", stderr, "..." if len(stderr) > 200 else "")
                     
             task.mark_completed(result={
                 "returncode": returncode,
                 "stdout": stdout,
-                "stderr": stderr
+                "stderr": stderr,
+                "stdout_bytes": stdout_bytes,
+                "stderr_bytes": stderr_bytes
             })
         except Exception as e:
             logger.error(f"Error executing command: {str(e)}", exc_info=True)
@@ -495,15 +759,26 @@ class SwarmController:
         version = task.data.get("version", "")
         upgrade = task.data.get("upgrade", False)
         verbose = task.data.get("verbose", True)
+        log_verbose = verbose and logger.isEnabledFor(logging.INFO)
         
         if not package_name:
             task.mark_completed(error="Missing package name")
             return
         
-        if verbose:
-            logger.info(f"🧠 PACKAGE INSTALLATION: Preparing to install {package_name}" + 
-                       (f" version {version}" if version else "") +
-                       (" with upgrade" if upgrade else ""))
+        if log_verbose:
+            logger.info("🧠 PACKAGE INSTALLATION: Preparing to install %s%s%s", package_name,
+                        f" version {version}" if version else "",
+                        " with upgrade" if upgrade else "")
+        
+        # The pip thread completes the task; this worker is free for the next one
+        with self._pip_executor_lock:
+            if self._pip_executor is None:
+                self._pip_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pip")
+            self._pip_executor.submit(self._install_package, task, package_name, version, upgrade, verbose)
+    
+    def _install_package(self, task: Task, package_name: str, version: str, upgrade: bool, verbose: bool):
+        """Run pip for an install task and complete the task with its outcome."""
+        log_verbose = verbose and logger.isEnabledFor(logging.INFO)
         
         try:
             # Build pip install command
@@ -517,8 +792,8 @@ class SwarmController:
             else:
                 cmd.append(package_name)
                 
-            if verbose:
-                logger.info(f"🧠 EXECUTING: {' '.join(cmd)}")
+            if log_verbose:
+                logger.info("🧠 EXECUTING: %s", " ".join(cmd))
                 
             # Run pip command
             process = subprocess.run(
@@ -529,20 +804,32 @@ class SwarmController:
             )
             
             if process.returncode == 0:
-                if verbose:
-                    logger.info(f"🧠 SUCCESS: Package {package_name} installed successfully")
+                if log_verbose:
+                    logger.info("🧠 SUCCESS: Package %s installed successfully", package_name)
                     
-                # Try to import the newly installed package
+                # Try to import the newly installed package, in a separate process so that
+                # the controller does not keep it loaded or run its import-time side effects
+                module_name = _top_level_module(package_name)
                 try:
-                    # Convert from package_name to module_name (e.g., "package-name" to "package_name")
-                    module_name = package_name.replace("-", "_")
-                    importlib.import_module(module_name)
-                    if verbose:
-                        logger.info(f"🧠 VERIFICATION: Successfully imported {module_name}")
-                except ImportError as ie:
-                    if verbose:
-                        logger.warning(f"🧠 NOTICE: Package installed but import failed: {str(ie)}")
-                        logger.info("🧠 HINT: Package may use a different module name than the package name")
+                    probe = subprocess.run(
+                        [sys.executable, "-c", f"import {module_name}"],
+                        capture_output=True,
+                        text=True,
+                        timeout=IMPORT_PROBE_TIMEOUT
+                    )
+                    imported = probe.returncode == 0
+                    # The last stderr line holds the exception, e.g. "ModuleNotFoundError: ..."
+                    import_error = (probe.stderr.strip().splitlines() or [f"exit code {probe.returncode}"])[-1]
+                except subprocess.TimeoutExpired:
+                    imported = False
+                    import_error = f"import of {module_name} timed out after {IMPORT_PROBE_TIMEOUT}s"
+                
+                if imported:
+                    if log_verbose:
+                        logger.info("🧠 VERIFICATION: Successfully imported %s", module_name)
+                elif verbose:
+                    logger.warning("🧠 NOTICE: Package installed but import failed: %s", import_error)
+                    logger.info("🧠 HINT: Package may use a different module name than the package name")
                         
                 task.mark_completed(result={
                     "success": True,
@@ -552,8 +839,8 @@ class SwarmController:
                 })
             else:
                 if verbose:
-                    logger.error(f"🧠 ERROR: Failed to install {package_name}")
-                    logger.error(f"🧠 PIP OUTPUT: {process.stderr}")
+                    logger.error("🧠 ERROR: Failed to install %s", package_name)
+                    logger.error("🧠 PIP OUTPUT: %s", process.stderr)
                     
                 task.mark_completed(result={
                     "success": False,
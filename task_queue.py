@@ -1,6 +1,6 @@
 """Task queue implementation for the Gemini Swarm Debugger."""
 import queue
-from typing import Optional, Any
+from typing import Optional, Any, Iterable
 
 
 class TaskQueue:
@@ -18,13 +18,29 @@ class TaskQueue:
         """
         self._queue.put(item)
     
-    def pop(self) -> Optional[Any]:
+    def push_many(self, items: Iterable[Any]) -> None:
+        """Add several items to the end of the queue.
+        
+        Args:
+            items: The items to add, in order.
+        """
+        for item in items:
+            self._queue.put(item)
+    
+    def pop(self, timeout: Optional[float] = None) -> Optional[Any]:
         """Remove and return the next item from the queue.
         
+        Args:
+            timeout: Seconds to wait for an item, or None to wait indefinitely.
+        
         Returns:
-            The next item in the queue, or blocks until an item is available.
+            The next item in the queue, blocking until an item is available,
+            or None if the timeout expired first.
         """
-        return self._queue.get()
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
     
     def size(self) -> int:
         """Get the current size of the queue.
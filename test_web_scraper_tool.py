@@ -0,0 +1,66 @@
+"""
+Test the web scraper's content extraction on pages with navigation and footer markup.
+
+This script parses sample pages offline, the same way the scraper parses fetched
+pages, and checks that navigation and footer content never reaches the output.
+"""
+from superagi_replit.tools.web_scraper_tool import WebScraperTool, _CONTENT_STRAINER, _elements_strainer
+
+
+PAGE = (
+    b"<html><head><title>T</title></head><body>"
+    b"<nav><ul><li>Home</li><li>About</li></ul></nav>"
+    b"<h2>Sec</h2><p>para one</p>"
+    b"<footer><p>Copyright footer text</p></footer>"
+    b"</body></html>"
+)
+
+
+def test_main_content_skips_nav_and_footer():
+    """Test that the main content extraction drops navigation and footer content."""
+    print("\n==== Testing Main Content ====")
+    scraper = WebScraperTool()
+
+    content = scraper._extract_main_content(scraper._parse_html(PAGE, _CONTENT_STRAINER))
+    print(f"Main content: {content!r}")
+
+    assert content == "T\n\npara one"
+
+
+def test_structured_content_skips_nav_and_footer():
+    """Test that the structured extraction drops navigation and footer content."""
+    print("\n==== Testing Structured Content ====")
+    scraper = WebScraperTool()
+
+    content = scraper._extract_structured_content(scraper._parse_html(PAGE, _CONTENT_STRAINER), 2)
+    print(f"Structured content: {content!r}")
+
+    assert "para one" in content
+    assert "Copyright footer text" not in content
+    assert "Home" not in content
+
+
+def test_elements_skip_nav_and_footer():
+    """Test that element extraction ignores matches inside navigation and footers."""
+    print("\n==== Testing Element Extraction ====")
+    scraper = WebScraperTool()
+
+    soup = scraper._parse_html(PAGE, _elements_strainer(["p", "li"]))
+    content = scraper._extract_elements(soup, ["p", "li"])
+    print(f"Elements: {content!r}")
+
+    assert "para one" in content
+    assert "Copyright footer text" not in content
+    assert "Home" not in content
+
+
+def main():
+    """Run all the scraper tests."""
+    test_main_content_skips_nav_and_footer()
+    test_structured_content_skips_nav_and_footer()
+    test_elements_skip_nav_and_footer()
+    print("\nAll tests completed successfully.")
+
+
+if __name__ == "__main__":
+    main()